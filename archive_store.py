@@ -0,0 +1,164 @@
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+ARCHIVES_DIR = 'archives'
+BLOBS_DIR = 'blobs'  # Subfolder of the archive store holding one blob per distinct content
+MANIFEST_NAME = 'manifest.jsonl'  # One line per archived file: source name, date, content hash, blob
+# Already compressed inputs are stored as they are
+UNCOMPRESSED_EXTENSIONS = ('.zip', '.gz')
+
+_manifest_lock = threading.Lock()
+
+class ArchiveStore:
+    """
+    Content-addressed archive of the processed input files (HTML exports and ZIP files).
+    Each distinct content is stored once, gzip-compressed, under blobs/<hash[:2]>/<hash>.gz; an append-only
+    JSON-lines manifest maps each archived source name and date to its blob, so re-exports of the same job
+    cost a manifest line and same-named files never overwrite each other.
+    """
+
+    def __init__(self, root=ARCHIVES_DIR):
+        """
+        Args:
+            root (str): Folder of the archive store.
+        """
+        self.root = root
+        self.manifest_path = os.path.join(root, MANIFEST_NAME)
+
+    def blob_path(self, digest, compressed=True):
+        """
+        Returns the path of the blob of a content hash.
+        """
+        return os.path.join(self.root, BLOBS_DIR, digest[:2], digest + ('.gz' if compressed else ''))
+
+    def store(self, path, name=None, archived_at=None):
+        """
+        Archives a file: stores its content if it is not already in the store, records it in the manifest,
+        then removes the source file.
+        Args:
+            path (str): Path to the file to archive.
+            name (str, optional): Source name recorded in the manifest (file name of path by default).
+            archived_at (str, optional): Archiving date recorded in the manifest (now by default).
+        Returns:
+            dict: Manifest entry with keys 'name', 'archived_at', 'sha256', 'size', 'blob' and 'duplicate'
+            (True if the content was already in the store).
+        """
+        name = name or os.path.basename(path)
+        compressed = not name.lower().endswith(UNCOMPRESSED_EXTENSIONS)
+        blobs_dir = os.path.join(self.root, BLOBS_DIR)
+        os.makedirs(blobs_dir, exist_ok=True)
+        # Hash and compress in a single read of the source, then file the blob under its hash
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=blobs_dir, suffix='.tmp')
+        try:
+            with open(path, 'rb') as src, os.fdopen(fd, 'wb') as raw:
+                out = gzip.GzipFile(filename='', mode='wb', fileobj=raw, mtime=0) if compressed else raw
+                try:
+                    for chunk in iter(lambda: src.read(1024 * 1024), b''):
+                        digest.update(chunk)
+                        size += len(chunk)
+                        out.write(chunk)
+                finally:
+                    if compressed:
+                        out.close()
+            blob = self.blob_path(digest.hexdigest(), compressed)
+            duplicate = os.path.exists(blob)
+            if duplicate:
+                os.remove(tmp_path)
+            else:
+                os.makedirs(os.path.dirname(blob), exist_ok=True)
+                os.replace(tmp_path, blob)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        entry = {
+            'name': name,
+            'archived_at': archived_at or time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'sha256': digest.hexdigest(),
+            'size': size,
+            'blob': os.path.relpath(blob, self.root),
+        }
+        with _manifest_lock, open(self.manifest_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        os.remove(path)
+        return dict(entry, duplicate=duplicate)
+
+    def entries(self, name=None):
+        """
+        Returns the manifest entries, oldest first, optionally only those of a source name.
+        """
+        if not os.path.exists(self.manifest_path):
+            return []
+        with open(self.manifest_path, 'r', encoding='utf-8') as f:
+            entries = [json.loads(line) for line in f if line.strip()]
+        return [e for e in entries if name is None or e['name'] == name]
+
+    def restore(self, entry, dest):
+        """
+        Writes the original content of an archived file to dest/<name>.
+        Returns:
+            str: Path of the restored file.
+        """
+        os.makedirs(dest, exist_ok=True)
+        output_path = os.path.join(dest, entry['name'])
+        blob = os.path.join(self.root, entry['blob'])
+        opener = gzip.open if blob.endswith('.gz') else open
+        with opener(blob, 'rb') as src, open(output_path, 'wb') as out:
+            shutil.copyfileobj(src, out)
+        return output_path
+
+    def migrate(self):
+        """
+        Moves the raw files archived by previous versions (files at the top level of the store) into the store,
+        recording their modification time as archiving date.
+        Returns:
+            list: Manifest entries of the migrated files.
+        """
+        migrated = []
+        for fname in sorted(os.listdir(self.root)) if os.path.isdir(self.root) else []:
+            path = os.path.join(self.root, fname)
+            if fname == MANIFEST_NAME or not os.path.isfile(path):
+                continue
+            archived_at = time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(os.path.getmtime(path)))
+            migrated.append(self.store(path, archived_at=archived_at))
+        return migrated
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Consulte et restaure les fichiers archivés.")
+    parser.add_argument('--archives', default=ARCHIVES_DIR, help=f"Dossier des archives (défaut : {ARCHIVES_DIR})")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    list_cmd = subparsers.add_parser('list', help="Liste les fichiers archivés")
+    list_cmd.add_argument('name', nargs='?', help="Nom du fichier source (tous par défaut)")
+    restore_cmd = subparsers.add_parser('restore', help="Restaure la dernière version archivée d'un fichier")
+    restore_cmd.add_argument('name', help="Nom du fichier source, ex. job.html")
+    restore_cmd.add_argument('--dest', default='.', help="Dossier où écrire le fichier (défaut : dossier courant)")
+    subparsers.add_parser('migrate', help="Range dans le stockage les fichiers archivés par les versions précédentes")
+    args = parser.parse_args(argv)
+    store = ArchiveStore(args.archives)
+    if args.command == 'list':
+        for entry in store.entries(args.name):
+            print(f"{entry['archived_at']}  {entry['sha256'][:12]}  {entry['size']:>10}  {entry['name']}")
+    elif args.command == 'restore':
+        entries = store.entries(args.name)
+        if not entries:
+            print(f"Aucune archive pour {args.name}")
+            return 1
+        print(f"Restauré {store.restore(entries[-1], args.dest)} (archivé le {entries[-1]['archived_at']})")
+    elif args.command == 'migrate':
+        migrated = store.migrate()
+        duplicates = sum(1 for e in migrated if e['duplicate'])
+        print(f"{len(migrated)} fichier(s) rangé(s) dans {args.archives}, dont {duplicates} doublon(s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
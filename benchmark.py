@@ -0,0 +1,185 @@
+import argparse
+import contextlib
+import io
+import math
+import os
+import tempfile
+import time
+from talend_doc_cleaner import (
+    ComponentIndex, ContextResolver, extract_context_usages, extract_sections, extract_unique_components,
+    generate_markdown, get_component_catalog, is_rendered_section, parse_html, write_o2t_header, write_section,
+)
+from rules import SECTIONS_TO_IGNORE, KeywordMatcher
+from talend_html_generator import generate_talend_html
+
+# Size tiers of the stage benchmark: number of components (context variables and sections scale with it)
+DEFAULT_TIERS = [50, 200, 800]
+# Rule list sizes of the rules benchmark
+DEFAULT_RULE_TIERS = [30, 300, 3000]
+
+def time_call(func, repeat):
+    """
+    Returns the best wall time, in seconds, of repeat calls to func (its console output is discarded).
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def bench_parsers(paths, repeat=3):
+    """
+    Times generate_markdown on each HTML file with every available parser backend,
+    and checks that every backend generates the same markdown.
+    Args:
+        paths (list): Paths to Talend HTML documentation files.
+        repeat (int): Number of runs per file and backend (the best time is kept).
+    """
+    backends = ['html.parser']
+    try:
+        import lxml  # noqa: F401
+        backends.append('lxml')
+    except ImportError:
+        print("lxml n'est pas installé : seul html.parser est mesuré.")
+    print(f"{'Fichier':<40} {'Taille':>10} " + ' '.join(f"{b:>12}" for b in backends) + f" {'Gain':>7}  Sortie")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for path in paths:
+            timings = []
+            outputs = []
+            for backend in backends:
+                output_path = os.path.join(tmp_dir, f"{backend}.md")
+                timings.append(time_call(lambda: generate_markdown(path, output_path, parser=backend), repeat))
+                with open(output_path, 'r', encoding='utf-8') as f:
+                    outputs.append(f.read())
+            gain = f"x{timings[0] / timings[-1]:.1f}"
+            identical = 'identique' if all(o == outputs[0] for o in outputs) else 'DIFFÉRENTE'
+            size = f"{os.path.getsize(path) / 1024:.0f} Ko"
+            print(f"{os.path.basename(path)[:40]:<40} {size:>10} " + ' '.join(f"{t:>11.3f}s" for t in timings) + f" {gain:>7}  {identical}")
+
+def time_stages(html, parser=None, repeat=1):
+    """
+    Times each stage of the markdown generation on an HTML document.
+    Args:
+        html (str): HTML document.
+        parser (str, optional): Parser backend (see parse_html).
+        repeat (int): Number of runs per stage (the best time is kept).
+    Returns:
+        dict: Stage name -> best wall time in seconds, in pipeline order.
+    """
+    catalog = get_component_catalog()
+    catalog.descriptions()
+    state = {}
+
+    def parse():
+        state['soup'] = parse_html(html, parser)
+
+    def sections():
+        state['sections'] = extract_sections(state['soup'])
+
+    def components():
+        state['unique_components'] = extract_unique_components(state['soup'])
+
+    def context_usages():
+        state['context_vars'] = extract_context_usages(state['soup'])
+
+    def context_resolution():
+        resolver = ContextResolver.from_soup(state['soup'])
+        for var in state['context_vars']:
+            resolver.get(var.replace('context.', ''))
+        state['resolver'] = resolver
+
+    def component_index():
+        state['components'] = ComponentIndex.from_soup(state['soup'])
+
+    def o2t_header():
+        write_o2t_header(io.StringIO(), state['unique_components'], catalog, state['soup'], state['components'])
+
+    def rendering():
+        out = io.StringIO()
+        for section in state['sections']:
+            if not is_rendered_section(section['title']):
+                continue
+            write_section(out, section, state['unique_components'], catalog, state['context_vars'],
+                          state['soup'], state['resolver'], state['components'], parser)
+
+    stages = [
+        ('parse', parse), ('extract_sections', sections), ('extract_unique_components', components),
+        ('extract_context_usages', context_usages), ('context resolution', context_resolution),
+        ('component index', component_index), ('write_o2t_header', o2t_header), ('rendering', rendering),
+    ]
+    return {name: time_call(func, repeat) for name, func in stages}
+
+def bench_stages(tiers=DEFAULT_TIERS, parser=None, repeat=1):
+    """
+    Times each stage on synthetic documents of increasing size, and reports how each stage scales.
+    The scaling exponent is the slope of log(time) over log(document size) between the first and last tier:
+    about 1 for a linear stage, about 2 for a quadratic one.
+    Args:
+        tiers (list): Number of components of each tier; context variables and sections scale with it.
+        parser (str, optional): Parser backend (see parse_html).
+        repeat (int): Number of runs per stage (the best time is kept).
+    """
+    sizes = []
+    timings = []
+    for n in tiers:
+        html = generate_talend_html(components=n, context_vars=max(n // 2, 1), context_tables=3, sections=max(n // 10, 1))
+        sizes.append(len(html.encode('utf-8')))
+        timings.append(time_stages(html, parser, repeat))
+    header = f"{'Étape':<28}" + ''.join(f"{f'{n} comp.':>14}" for n in tiers) + f"{'Exposant':>10}"
+    print(header)
+    print(f"{'(taille du document)':<28}" + ''.join(f"{f'{size / 1024:.0f} Ko':>14}" for size in sizes))
+    for stage in timings[0]:
+        exponent = ''
+        if len(tiers) > 1 and timings[0][stage] > 0 and sizes[-1] > sizes[0]:
+            exponent = math.log(timings[-1][stage] / timings[0][stage]) / math.log(sizes[-1] / sizes[0])
+            exponent = f"{exponent:.2f}" + (' !' if exponent > 1.5 else '')
+        print(f"{stage:<28}" + ''.join(f"{t[stage] * 1000:>12.1f}ms" for t in timings) + f"{exponent:>10}")
+    print("\n'!' : étape plus que linéaire (exposant > 1.5), probablement quadratique.")
+
+def bench_rules(tiers=DEFAULT_RULE_TIERS, titles=2000, repeat=3):
+    """
+    Times the matching of section titles against ignored-section rule lists of increasing size,
+    with the compiled KeywordMatcher and with a scan of the keywords, to check that the compiled cost stays flat.
+    Args:
+        tiers (list): Number of keywords of each tier (the default keywords, then synthetic ones).
+        titles (int): Number of titles matched per run.
+        repeat (int): Number of runs per measure (the best time is kept).
+    """
+    samples = ['Liste des composants', 'Description', 'Context List', 'Paramètres supplémentaires', 'tMap_1', 'Résumé']
+    texts = [samples[i % len(samples)] + f' {i}' for i in range(titles)]
+    print(f"{'Règles':>8}{'compilées':>14}{'parcours':>14}")
+    for n in tiers:
+        keywords = (SECTIONS_TO_IGNORE + [f'mot-clé synthétique {i:05d}' for i in range(n)])[:max(n, 1)]
+        matcher = KeywordMatcher(keywords)
+        compiled = time_call(lambda: [matcher(t) for t in texts], repeat)
+        scan = time_call(lambda: [any(k.lower() in t.lower() for k in keywords) for t in texts], repeat)
+        print(f"{n:>8}{compiled * 1000:>12.1f}ms{scan * 1000:>12.1f}ms")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mesure les performances de la génération de documentation.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    parsers_cmd = subparsers.add_parser('parsers', help="Compare les moteurs d'analyse HTML (html.parser, lxml)")
+    parsers_cmd.add_argument('paths', nargs='+', help="Fichiers HTML de documentation Talend")
+    parsers_cmd.add_argument('--repeat', type=int, default=3, help="Nombre d'exécutions par mesure (défaut : 3)")
+    stages_cmd = subparsers.add_parser('stages', help="Mesure chaque étape sur des documents synthétiques de taille croissante")
+    stages_cmd.add_argument('--tiers', default=','.join(map(str, DEFAULT_TIERS)),
+                            help="Nombres de composants des paliers, séparés par des virgules (défaut : 50,200,800)")
+    stages_cmd.add_argument('--parser', choices=['lxml', 'html.parser'], default=None,
+                            help="Moteur d'analyse HTML (défaut : lxml s'il est installé, sinon html.parser)")
+    stages_cmd.add_argument('--repeat', type=int, default=1, help="Nombre d'exécutions par mesure (défaut : 1)")
+    rules_cmd = subparsers.add_parser('rules', help="Mesure le coût des règles de filtrage selon leur nombre")
+    rules_cmd.add_argument('--tiers', default=','.join(map(str, DEFAULT_RULE_TIERS)),
+                           help="Nombres de règles des paliers, séparés par des virgules (défaut : 30,300,3000)")
+    args = parser.parse_args(argv)
+    if args.command == 'parsers':
+        bench_parsers(args.paths, repeat=args.repeat)
+    elif args.command == 'stages':
+        bench_stages([int(n) for n in args.tiers.split(',')], parser=args.parser, repeat=args.repeat)
+    elif args.command == 'rules':
+        bench_rules([int(n) for n in args.tiers.split(',')])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import hashlib
+import json
+import os
+import tempfile
+from rules import RULES_PATH
+from talend_doc_cleaner import COMPOSANTS_YAML_PATH, GENERATOR_VERSION
+
+MANIFEST_PATH = 'markdowns.manifest.json'  # Build manifest, stored next to markdowns/
+
+def file_digest(path):
+    """
+    Returns the SHA-256 hex digest of a file, read by chunks.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class BuildManifest:
+    """
+    Incremental build cache: maps each generated markdown file to the build key (hash of the input HTML,
+    composants.yaml, regles.yaml and the generator version) it was generated from.
+    An input whose key matches the one recorded for its markdown file, still present, does not need to be regenerated,
+    unless one of the other files the markdown file documents (e.g. history CSV files, see history_files.py)
+    changed since: their signatures are recorded with the key.
+    """
+
+    def __init__(self, path=MANIFEST_PATH, catalog_path=COMPOSANTS_YAML_PATH, rules_path=RULES_PATH, variant=''):
+        """
+        Args:
+            path (str): Path to the JSON manifest file.
+            catalog_path (str): Path to the component descriptions YAML file.
+            rules_path (str): Path to the filtering rules YAML file (see rules.py).
+            variant (str): Output options changing the content of the generated files (e.g. the parser backend),
+                so that files generated without them are not considered up to date.
+        """
+        self.path = path
+        self.entries = {}
+        self.dependencies = {}  # Output path -> {dependency path: signature}
+        self.recorded = {}  # Entries recorded by this run, merged into the file on save
+        self.recorded_dependencies = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.entries = data.get('entries', {})
+                self.dependencies = data.get('dependencies', {})
+            except Exception as e:
+                print(f"Manifeste de build illisible ({path}), reconstruction complète : {e}")
+        catalog_digest = file_digest(catalog_path) if os.path.exists(catalog_path) else ''
+        rules_digest = file_digest(rules_path) if os.path.exists(rules_path) else ''
+        self.salt = f"{catalog_digest}:{rules_digest}:{GENERATOR_VERSION}" + (f":{variant}" if variant else '')
+
+    def build_key(self, input_path):
+        """
+        Returns the build key of an input HTML file.
+        """
+        return hashlib.sha256(f"{file_digest(input_path)}:{self.salt}".encode('utf-8')).hexdigest()
+
+    def is_up_to_date(self, key, output_path, signatures=None):
+        """
+        Returns True if key was already built into output_path and that file still exists.
+        Args:
+            key (str): Build key of the input (see build_key).
+            output_path (str): Path of the generated file.
+            signatures (callable, optional): Returns the current signatures of a list of dependency paths
+                (path -> signature); the dependencies recorded with output_path must then be unchanged.
+        """
+        if self.entries.get(output_path) != key or not os.path.exists(output_path):
+            return False
+        recorded = self.dependencies.get(output_path)
+        if not recorded or signatures is None:
+            return True
+        # A dependency that could not be read (None) is never up to date
+        return None not in recorded.values() and signatures(list(recorded)) == recorded
+
+    def record(self, key, output_path, dependencies=None):
+        """
+        Records a successful build of key into output_path.
+        Args:
+            dependencies (dict, optional): Signatures of the other files documented in output_path (path -> signature).
+        """
+        self.entries[output_path] = key
+        self.recorded[output_path] = key
+        self.dependencies[output_path] = self.recorded_dependencies[output_path] = dependencies or {}
+
+    def save(self):
+        """
+        Writes the manifest atomically (temporary file then rename).
+        The entries recorded by this run are merged into the current file, so that instances sharing the manifest
+        (see work_claims.py) keep each other's entries.
+        """
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.entries = dict(data.get('entries', {}), **self.recorded)
+                self.dependencies = dict(data.get('dependencies', {}), **self.recorded_dependencies)
+            except Exception:
+                pass
+        self.dependencies = {p: d for p, d in self.dependencies.items() if d}
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)), suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'generator_version': GENERATOR_VERSION, 'entries': self.entries, 'dependencies': self.dependencies},
+                      f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
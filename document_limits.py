@@ -0,0 +1,116 @@
+import math
+import os
+import signal
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # Windows: no kernel limits
+    resource = None
+
+DOCUMENT_TIMEOUT = 300  # Default wall-clock budget of one conversion, in seconds
+DOCUMENT_MEMORY_MB = 2048  # Default resident memory budget of one conversion, in MB
+CHECK_INTERVAL = 0.25  # Seconds between two checks of the budgets of the running conversion
+CPU_GRACE = 30  # CPU seconds granted beyond the timeout before the kernel kills a worker stuck outside the interpreter
+
+class LimitExceeded(BaseException):
+    """
+    Raised in a conversion that exceeded its time or memory budget.
+    Like KeyboardInterrupt, it derives from BaseException so that the error handlers of the conversion
+    (except Exception) do not swallow it, e.g. leaving an empty component catalog cached.
+    """
+
+    def __init__(self, reason, message):
+        """
+        Args:
+            reason (str): 'timeout' or 'memory'.
+            message (str): Description of the exceeded budget.
+        """
+        super().__init__(message)
+        self.reason = reason
+
+def _statm_mb(field):
+    """
+    Returns a field of /proc/self/statm (0: virtual size, 1: resident size) in MB, None without /proc.
+    """
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[field]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+def rss_mb():
+    """
+    Returns the resident memory of the current process in MB, None if it cannot be read (no /proc).
+    """
+    return _statm_mb(1)
+
+class DocumentLimits:
+    """
+    Context manager running a conversion under a wall-clock and a resident memory budget.
+    A periodic timer signal checks both budgets and raises LimitExceeded in the conversion as soon as one is exceeded,
+    so that the worker survives and goes on with the next document.
+    With hard=True (worker processes only), kernel limits back the checks up for code that never returns to the
+    interpreter: the CPU time is capped a little beyond the timeout (the kernel then kills the worker),
+    and the address space a little beyond the memory budget (allocations then fail with MemoryError).
+    Budgets are only enforced on POSIX systems, in the main thread; the memory budget needs /proc (Linux).
+    """
+
+    def __init__(self, timeout=None, memory_mb=None, hard=False):
+        """
+        Args:
+            timeout (float, optional): Wall-clock budget in seconds, None for no limit.
+            memory_mb (float, optional): Resident memory budget in MB, None for no limit.
+            hard (bool): Also set the kernel limits of the current process (worker processes only).
+        """
+        self.timeout = timeout
+        self.memory_mb = memory_mb
+        self.hard = hard
+        self._armed = False
+        self._rlimits = {}
+
+    def __enter__(self):
+        self.start = time.monotonic()
+        if not (self.timeout or self.memory_mb) or not hasattr(signal, 'setitimer'):
+            return self
+        if threading.current_thread() is not threading.main_thread():
+            return self
+        self._previous = signal.signal(signal.SIGALRM, self._check)
+        signal.setitimer(signal.ITIMER_REAL, CHECK_INTERVAL, CHECK_INTERVAL)
+        self._armed = True
+        if self.hard and resource is not None:
+            if self.timeout:
+                usage = resource.getrusage(resource.RUSAGE_SELF)
+                self._set_rlimit(resource.RLIMIT_CPU, math.ceil(usage.ru_utime + usage.ru_stime + self.timeout + CPU_GRACE))
+            vm = _statm_mb(0)
+            if self.memory_mb and vm is not None:
+                self._set_rlimit(resource.RLIMIT_AS, int((vm + 2 * self.memory_mb) * 2 ** 20))
+        return self
+
+    def __exit__(self, *exc):
+        if self._armed:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, self._previous)
+            self._armed = False
+        for limit, previous in self._rlimits.items():
+            resource.setrlimit(limit, previous)
+        self._rlimits = {}
+        return False
+
+    def _set_rlimit(self, limit, soft):
+        previous = resource.getrlimit(limit)
+        if previous[1] != resource.RLIM_INFINITY:
+            soft = min(soft, previous[1])
+        resource.setrlimit(limit, (soft, previous[1]))
+        self._rlimits[limit] = previous
+
+    def _check(self, signum, frame):
+        # Raised again at each tick until it leaves the conversion, even through code that catches and ignores errors
+        elapsed = time.monotonic() - self.start
+        if self.timeout and elapsed > self.timeout:
+            raise LimitExceeded('timeout', f"durée maximale dépassée ({self.timeout:g} s)")
+        if self.memory_mb:
+            rss = rss_mb()
+            if rss is not None and rss > self.memory_mb:
+                raise LimitExceeded('memory', f"mémoire maximale dépassée ({self.memory_mb:g} Mo)")
@@ -0,0 +1,149 @@
+import os
+import queue
+import threading
+import time
+from job_document import HistoryFileStats
+
+HISTORY_PREVIEW_ROWS = 5  # Default number of last rows previewed per history file
+TAIL_BLOCK_SIZE = 64 * 1024  # Bytes read at a time, backwards from the end of a history file
+TAIL_MAX_BYTES = 1024 * 1024  # Never read more than this from the end of a history file, however long its rows
+PREVIEW_LINE_CHARS = 300  # Previewed rows are cut beyond this length
+STAT_WORKERS = 8  # History files read at once
+STAT_TIMEOUT = 5  # Seconds after which the history files not read yet are given up (e.g. network folder unavailable)
+NOT_FOUND = 'introuvable'  # Error of a history file that does not exist
+
+def tail_rows(path, rows, size=None):
+    """
+    Returns the last rows of a text file, reading it backwards from its end by blocks:
+    only the end of the file is read (at most TAIL_MAX_BYTES), whatever its size.
+    Args:
+        path (str): Path to the file.
+        rows (int): Number of rows.
+        size (int, optional): Size of the file, if already known.
+    Returns:
+        list: Last rows (str) in file order, cut beyond PREVIEW_LINE_CHARS; fewer if the file has fewer complete rows
+            in its last TAIL_MAX_BYTES.
+    """
+    if rows <= 0:
+        return []
+    with open(path, 'rb') as f:
+        end = size if size is not None else f.seek(0, os.SEEK_END)
+        pos = end
+        data = b''
+        while pos > 0 and data.count(b'\n') <= rows and end - pos < TAIL_MAX_BYTES:
+            step = min(TAIL_BLOCK_SIZE, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    lines = data.split(b'\n')
+    if lines and not lines[-1].strip():
+        lines.pop()
+    if pos > 0 and lines:
+        lines.pop(0)  # Partial row: the block started in the middle of it
+    result = []
+    for line in lines[-rows:]:
+        try:
+            text = line.decode('utf-8')
+        except UnicodeDecodeError:
+            text = line.decode('latin-1')
+        text = text.rstrip('\r')
+        result.append(text if len(text) <= PREVIEW_LINE_CHARS else text[:PREVIEW_LINE_CHARS] + '…')
+    return result
+
+def history_file_stats(path, rows=HISTORY_PREVIEW_ROWS):
+    """
+    Returns the size, modification time and last rows of a history file (see HistoryFileStats).
+    Errors are recorded in the result rather than raised.
+    """
+    try:
+        st = os.stat(path)
+        if not os.path.isfile(path):
+            return HistoryFileStats(path, error="n'est pas un fichier")
+        return HistoryFileStats(path, st.st_size, st.st_mtime, tail_rows(path, rows, st.st_size))
+    except FileNotFoundError:
+        return HistoryFileStats(path, error=NOT_FOUND)
+    except OSError as e:
+        return HistoryFileStats(path, error=e.strerror or str(e))
+
+_cache = {}
+_cache_run = None
+
+def stat_history_files(paths, rows=HISTORY_PREVIEW_ROWS, run=None, timeout=STAT_TIMEOUT):
+    """
+    Reads the state of history files in one batched pass: the files are read concurrently, and the pass ends
+    after timeout seconds at most, the files not read by then being reported unavailable, so that a slow or
+    unreachable network folder cannot stall a conversion. The reading threads are daemons: one stuck in
+    the file system does not keep the process from exiting.
+    Results are cached per run: a file listed by several jobs of the same run is only read once.
+    Args:
+        paths (list): Paths to the history files.
+        rows (int): Number of last rows previewed per file (0: size and modification time only).
+        run (str, optional): Identifier of the current run; the cache is emptied when it changes.
+            Without it, nothing is cached: the files are read again at each call.
+        timeout (float): Seconds after which the files not read yet are given up.
+    Returns:
+        dict: Path -> HistoryFileStats, for each of the paths.
+    """
+    global _cache, _cache_run
+    if run is None or run != _cache_run:
+        _cache, _cache_run = {}, run
+    todo = [p for p in dict.fromkeys(paths) if (p, rows) not in _cache]
+    if todo:
+        pending = queue.Queue()
+        for path in todo:
+            pending.put(path)
+        results = {}
+
+        def read():
+            while True:
+                try:
+                    path = pending.get_nowait()
+                except queue.Empty:
+                    return
+                results[path] = history_file_stats(path, rows)
+
+        threads = [threading.Thread(target=read, name='history-stat', daemon=True) for _ in range(min(STAT_WORKERS, len(todo)))]
+        for thread in threads:
+            thread.start()
+        deadline = time.monotonic() + timeout
+        for thread in threads:
+            thread.join(max(0, deadline - time.monotonic()))
+        for path in todo:
+            stats = results.get(path)
+            _cache[(path, rows)] = stats if stats is not None else HistoryFileStats(path, error='indisponible (délai dépassé)')
+    return {p: _cache[(p, rows)] for p in paths}
+
+def history_signatures(paths, rows=0, run=None, timeout=STAT_TIMEOUT):
+    """
+    Returns the signature of each history file, telling whether it changed since a document was generated
+    (see BuildManifest.is_up_to_date): [size, modification time], [None, None] if it does not exist,
+    or None if it could not be read (it must then be read again at the next run).
+    Args:
+        paths (list): Paths to the history files.
+        rows, run, timeout: See stat_history_files; with the rows and run of a conversion, the signatures
+            are those of the state documented by it.
+    Returns:
+        dict: Path -> signature.
+    """
+    signatures = {}
+    for path, stats in stat_history_files(paths, rows, run, timeout).items():
+        if stats.error is None:
+            signatures[path] = [stats.size, stats.mtime]
+        else:
+            signatures[path] = [None, None] if stats.error == NOT_FOUND else None
+    return signatures
+
+def format_size(size):
+    """
+    Returns a file size in bytes as a human-readable French string (e.g. '1.5 Mo').
+    """
+    for unit in ('o', 'Ko', 'Mo', 'Go'):
+        if size < 1024 or unit == 'Go':
+            return f"{size} {unit}" if unit == 'o' else f"{size:.1f} {unit}"
+        size /= 1024
+
+def format_mtime(mtime):
+    """
+    Returns a modification time (seconds since the epoch) as a local date and time, e.g. '18/10/2026 09:30'.
+    """
+    return time.strftime('%d/%m/%Y %H:%M', time.localtime(mtime))
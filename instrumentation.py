@@ -0,0 +1,131 @@
+import json
+import os
+import time
+import tracemalloc
+
+# Instrumentation state of the current process; disabled by default, span() then costs a single check
+_enabled = False
+_trace_memory = False
+_records = []
+_stack = []
+_document = None
+
+def enable(trace_memory=False):
+    """
+    Enables span recording in the current process.
+    Args:
+        trace_memory (bool): Also record the tracemalloc peak memory of each span (slows the conversion down).
+    """
+    global _enabled, _trace_memory
+    _enabled = True
+    _trace_memory = trace_memory
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+def disable():
+    """
+    Disables span recording in the current process.
+    """
+    global _enabled, _trace_memory
+    _enabled = False
+    if _trace_memory and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _trace_memory = False
+
+def is_enabled():
+    """
+    Returns True if span recording is enabled in the current process.
+    """
+    return _enabled
+
+def pop_records():
+    """
+    Returns the span records of the current process and clears them.
+    """
+    global _records
+    records, _records = _records, []
+    return records
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **fields):
+        pass
+
+_NULL_SPAN = _NullSpan()
+
+class Span:
+    """
+    Timed (and optionally memory-traced) region of a conversion, recorded on exit.
+    """
+
+    def __init__(self, name, document=None, fields=None):
+        self.name = name
+        self.document = document
+        self.fields = fields or {}
+        self.peak = 0
+
+    def set(self, **fields):
+        """
+        Adds fields to the record of the span (e.g. a size known only after reading the input).
+        """
+        self.fields.update(fields)
+
+    def __enter__(self):
+        global _document
+        self.previous_document = _document
+        if self.document is not None:
+            _document = self.document
+        if _trace_memory:
+            # Keep the peak reached so far by the enclosing span before measuring this one
+            peak = tracemalloc.get_traced_memory()[1]
+            if _stack:
+                _stack[-1].peak = max(_stack[-1].peak, peak)
+            tracemalloc.reset_peak()
+        _stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        global _document
+        wall = time.perf_counter() - self.start
+        _stack.pop()
+        record = {'span': self.name, 'document': _document, 'wall_ms': round(wall * 1000, 3)}
+        if _trace_memory:
+            self.peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+            if _stack:
+                _stack[-1].peak = max(_stack[-1].peak, self.peak)
+            record['peak_kb'] = round(self.peak / 1024, 1)
+        if exc_type is not None:
+            record['error'] = exc_type.__name__
+        record.update(self.fields)
+        _records.append(record)
+        _document = self.previous_document
+        return False
+
+def span(name, document=None, **fields):
+    """
+    Returns a context manager recording the wall time of a region under name.
+    Args:
+        name (str): Name of the span (e.g. 'parse', 'write_section').
+        document (str, optional): Document the span (and its nested spans) belongs to.
+        **fields: Extra fields of the record (e.g. size_bytes, title).
+    Returns:
+        Span, or a shared no-op object when instrumentation is disabled.
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return Span(name, document, fields)
+
+def write_metrics(path, records, run_id):
+    """
+    Appends span records to a JSON-lines metrics file, one record per line tagged with run_id.
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'a', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(dict(record, run=run_id), ensure_ascii=False) + '\n')
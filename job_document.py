@@ -0,0 +1,128 @@
+import json
+import os
+from dataclasses import dataclass, field
+
+# Version of the cached model format: cached models of another version are ignored (the HTML must be converted again)
+MODEL_VERSION = 1
+
+@dataclass(slots=True)
+class Section:
+    """
+    Rendered section of a job documentation: its title and the text of each of its content nodes.
+    """
+    title: str
+    blocks: list = field(default_factory=list)
+
+@dataclass(slots=True)
+class ContextParam:
+    """
+    Context parameter used by a job: name (e.g. context.MAIL_HOST), value shown in the documentation
+    (None if unknown or hidden) and component unique names or section titles using it.
+    """
+    name: str
+    value: str = None
+    used_by: list = field(default_factory=list)
+
+@dataclass(slots=True)
+class HistoryFileStats:
+    """
+    State of a history CSV file when the job was converted (see history_files.py): size in bytes,
+    modification time (seconds since the epoch), last rows, or the error that prevented reading it.
+    """
+    path: str
+    size: int = None
+    mtime: float = None
+    tail: list = field(default_factory=list)
+    error: str = None
+
+@dataclass(slots=True)
+class JobDocument:
+    """
+    Everything the markdown rendering needs from a job documentation, extracted once from the HTML.
+    Holds no reference to the parsed soup, and is saved as JSON so the markdown can be rendered again
+    (e.g. after a layout change) without parsing the HTML.
+    """
+    source: str = ''  # Name of the HTML file
+    connector: dict = field(default_factory=dict)  # Connector metadata (see parse_connector_info)
+    sections: list = field(default_factory=list)  # Section objects, in document order
+    component_types: list = field(default_factory=list)  # Sorted unique component types
+    components: dict = field(default_factory=dict)  # Unique name -> component type
+    o2t: list = field(default_factory=list)  # Rows of the One2Team header (see o2t_rows)
+    context: list = field(default_factory=list)  # ContextParam objects, sorted by name
+    history_files: list = field(default_factory=list)  # (file name, path) tuples, context variables substituted
+    history_stats: dict = field(default_factory=dict)  # Path -> HistoryFileStats, only with the history statistics option
+
+    def facts(self):
+        """
+        Returns the facts of the job indexed by job_index.py.
+        Returns:
+            dict: Facts with keys 'name', 'version', 'component_types', 'components' (unique name -> type),
+            'o2t' (rows of the One2Team header), 'context' ((name, displayed value, used by) tuples)
+            and 'history_files' ((file name, path) tuples).
+        """
+        return {
+            'name': self.connector.get('nom', ''),
+            'version': self.connector.get('version', ''),
+            'component_types': list(self.component_types),
+            'components': dict(self.components),
+            'o2t': [tuple(row) for row in self.o2t],
+            'context': [(p.name, p.value, list(p.used_by)) for p in self.context],
+            'history_files': [tuple(h) for h in self.history_files],
+        }
+
+    def to_dict(self):
+        """
+        Returns the document as JSON-serializable data.
+        """
+        return {
+            'model_version': MODEL_VERSION,
+            'source': self.source,
+            'connector': self.connector,
+            'sections': [[s.title, s.blocks] for s in self.sections],
+            'component_types': self.component_types,
+            'components': self.components,
+            'o2t': [list(row) for row in self.o2t],
+            'context': [[p.name, p.value, p.used_by] for p in self.context],
+            'history_files': [list(h) for h in self.history_files],
+            'history_stats': [[h.path, h.size, h.mtime, h.tail, h.error] for h in self.history_stats.values()],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Rebuilds a document from the data of to_dict.
+        """
+        return cls(
+            source=data['source'],
+            connector=data['connector'],
+            sections=[Section(title, blocks) for title, blocks in data['sections']],
+            component_types=data['component_types'],
+            components=data['components'],
+            o2t=[tuple(row) for row in data['o2t']],
+            context=[ContextParam(name, value, used_by) for name, value, used_by in data['context']],
+            history_files=[tuple(h) for h in data['history_files']],
+            history_stats={h[0]: HistoryFileStats(*h) for h in data.get('history_stats', [])},
+        )
+
+    def save(self, path):
+        """
+        Writes the document as JSON, atomically (temporary file then rename).
+        """
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads a document saved by save.
+        Returns:
+            JobDocument or None: None if the file was written by another version of the model.
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('model_version') != MODEL_VERSION:
+            return None
+        return cls.from_dict(data)
@@ -0,0 +1,193 @@
+import argparse
+import sqlite3
+import sys
+import time
+
+INDEX_PATH = 'talend_index.sqlite'  # Project-wide index of the converted jobs, stored next to markdowns/
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    name TEXT,
+    version TEXT,
+    markdown TEXT,
+    indexed_at TEXT
+);
+CREATE TABLE IF NOT EXISTS components (
+    job TEXT NOT NULL REFERENCES jobs(job) ON DELETE CASCADE,
+    unique_name TEXT,
+    type TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS o2t (
+    job TEXT NOT NULL REFERENCES jobs(job) ON DELETE CASCADE,
+    unique_name TEXT NOT NULL,
+    model TEXT,
+    query TEXT
+);
+CREATE TABLE IF NOT EXISTS context_vars (
+    job TEXT NOT NULL REFERENCES jobs(job) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    value TEXT,
+    used_by TEXT
+);
+CREATE TABLE IF NOT EXISTS history_files (
+    job TEXT NOT NULL REFERENCES jobs(job) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    path TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_components_type ON components(type);
+CREATE INDEX IF NOT EXISTS idx_components_job ON components(job);
+CREATE INDEX IF NOT EXISTS idx_o2t_job ON o2t(job);
+CREATE INDEX IF NOT EXISTS idx_context_vars_name ON context_vars(name);
+CREATE INDEX IF NOT EXISTS idx_context_vars_job ON context_vars(job);
+CREATE INDEX IF NOT EXISTS idx_history_files_job ON history_files(job);
+"""
+
+class JobIndex:
+    """
+    Local SQLite index of the facts extracted from each converted job: component types and unique names,
+    O2T models and queries, context parameters with their values, and history CSV files.
+    Each job is keyed by its name and the hash of its HTML export, so only changed jobs are rewritten.
+    """
+
+    def __init__(self, path=INDEX_PATH):
+        """
+        Args:
+            path (str): Path to the SQLite database file (created if missing).
+        """
+        self.path = path
+        # Wait for the other instances writing to the index (see work_claims.py) instead of failing at once
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def is_indexed(self, job, content_hash):
+        """
+        Returns True if the facts of job were already indexed from content_hash.
+        """
+        row = self.conn.execute("SELECT content_hash FROM jobs WHERE job = ?", (job,)).fetchone()
+        return row is not None and row[0] == content_hash
+
+    def upsert(self, job, content_hash, facts, markdown=None):
+        """
+        Replaces the facts of a job, unless they were already indexed from the same content.
+        Args:
+            job (str): Job key (name of the HTML export, without extension).
+            content_hash (str): Hash of the HTML export.
+            facts (dict): Facts returned by generate_markdown (see JobDocument.facts).
+            markdown (str, optional): Path to the generated markdown file.
+        Returns:
+            bool: True if the job was (re)indexed, False if it was unchanged.
+        """
+        if self.is_indexed(job, content_hash):
+            return False
+        with self.conn:
+            self.conn.execute("DELETE FROM jobs WHERE job = ?", (job,))
+            self.conn.execute(
+                "INSERT INTO jobs (job, content_hash, name, version, markdown, indexed_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job, content_hash, facts.get('name'), facts.get('version'), markdown, time.strftime('%Y-%m-%d %H:%M:%S')))
+            components = facts.get('components', {})
+            typed = set(components.values())
+            rows = [(job, name, comp_type) for name, comp_type in components.items()]
+            # Component types listed by the job without a parameter table of their own
+            rows += [(job, None, comp_type) for comp_type in facts.get('component_types', []) if comp_type not in typed]
+            self.conn.executemany("INSERT INTO components (job, unique_name, type) VALUES (?, ?, ?)", rows)
+            self.conn.executemany("INSERT INTO o2t (job, unique_name, model, query) VALUES (?, ?, ?, ?)",
+                                  [(job,) + tuple(row) for row in facts.get('o2t', [])])
+            self.conn.executemany("INSERT INTO context_vars (job, name, value, used_by) VALUES (?, ?, ?, ?)",
+                                  [(job, name, value, ', '.join(used_by)) for name, value, used_by in facts.get('context', [])])
+            self.conn.executemany("INSERT INTO history_files (job, name, path) VALUES (?, ?, ?)",
+                                  [(job, name, path) for name, path in facts.get('history_files', [])])
+        return True
+
+    def jobs_using_component(self, comp_type):
+        """
+        Returns (job, unique names) rows of the jobs using a component type, e.g. tSendMail.
+        """
+        return self.conn.execute(
+            "SELECT job, group_concat(unique_name, ', ') FROM components WHERE type = ? GROUP BY job ORDER BY job",
+            (comp_type,)).fetchall()
+
+    def jobs_using_context(self, name):
+        """
+        Returns (job, value, used by) rows of the jobs reading a context parameter, e.g. MAIL_HOST or context.MAIL_HOST.
+        """
+        if not name.startswith('context.'):
+            name = f'context.{name}'
+        return self.conn.execute(
+            "SELECT job, value, used_by FROM context_vars WHERE name = ? ORDER BY job", (name,)).fetchall()
+
+    def jobs_with_history_file(self, pattern):
+        """
+        Returns (job, file name, path) rows of the history CSV files whose path contains pattern.
+        """
+        return self.conn.execute(
+            "SELECT job, name, path FROM history_files WHERE path LIKE ? ORDER BY job, name", (f'%{pattern}%',)).fetchall()
+
+    def job_summary(self, job):
+        """
+        Returns the facts indexed for one job, or None if it is not indexed.
+        """
+        row = self.conn.execute("SELECT job, name, version, markdown, indexed_at FROM jobs WHERE job = ?", (job,)).fetchone()
+        if row is None:
+            return None
+        return {
+            'job': row[0], 'name': row[1], 'version': row[2], 'markdown': row[3], 'indexed_at': row[4],
+            'components': self.conn.execute(
+                "SELECT unique_name, type FROM components WHERE job = ? ORDER BY type, unique_name", (job,)).fetchall(),
+            'o2t': self.conn.execute(
+                "SELECT unique_name, model, query FROM o2t WHERE job = ? ORDER BY unique_name", (job,)).fetchall(),
+            'context': self.conn.execute(
+                "SELECT name, value, used_by FROM context_vars WHERE job = ? ORDER BY name", (job,)).fetchall(),
+            'history_files': self.conn.execute(
+                "SELECT name, path FROM history_files WHERE job = ? ORDER BY name", (job,)).fetchall(),
+        }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Interroge l'index des jobs Talend convertis.")
+    parser.add_argument('--index', default=INDEX_PATH, help=f"Base SQLite de l'index (défaut : {INDEX_PATH})")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('component', help="Jobs utilisant un type de composant").add_argument('type', help="ex. tSendMail")
+    subparsers.add_parser('context', help="Jobs lisant un paramètre contextuel").add_argument('name', help="ex. MAIL_HOST")
+    subparsers.add_parser('history', help="Fichiers historiques dont le chemin contient un motif").add_argument('pattern')
+    subparsers.add_parser('job', help="Informations indexées pour un job").add_argument('job', help="Nom du fichier HTML sans extension")
+    args = parser.parse_args(argv)
+    with JobIndex(args.index) as index:
+        if args.command == 'component':
+            rows = index.jobs_using_component(args.type)
+            for job, names in rows:
+                print(f"{job}\t{names or ''}")
+        elif args.command == 'context':
+            rows = index.jobs_using_context(args.name)
+            for job, value, used_by in rows:
+                print(f"{job}\t{value or ''}\t{used_by or ''}")
+        elif args.command == 'history':
+            rows = index.jobs_with_history_file(args.pattern)
+            for job, name, path in rows:
+                print(f"{job}\t{name}\t{path}")
+        elif args.command == 'job':
+            summary = index.job_summary(args.job)
+            rows = [summary] if summary else []
+            if summary:
+                print(f"{summary['job']} : {summary['name']} v{summary['version']} ({summary['markdown']}, indexé le {summary['indexed_at']})")
+                for section in ['components', 'o2t', 'context', 'history_files']:
+                    print(f"  {section} :")
+                    for row in summary[section]:
+                        print("    " + "\t".join(str(v) if v is not None else '' for v in row))
+        if not rows:
+            print("Aucun résultat.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,32 +1,704 @@
+import argparse
+import json
+import multiprocessing
 import os
-from talend_doc_cleaner import generate_markdown
-import talend_zip_importer
-
-def main():
-    # 1. Import ZIP files (talend_zip_importer script executes on import)
-    # 2. Generate markdown files for each imported HTML file
-    doc_dir = 'documentations'
-    md_dir = 'markdowns'
+import queue
+import signal
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import instrumentation
+from archive_store import ArchiveStore
+from build_manifest import BuildManifest, file_digest
+from document_limits import DOCUMENT_MEMORY_MB, DOCUMENT_TIMEOUT, DocumentLimits, LimitExceeded
+from history_files import HISTORY_PREVIEW_ROWS, history_signatures
+from job_index import INDEX_PATH, JobIndex
+from job_document import JobDocument
+from rules import get_rules
+from talend_doc_cleaner import DEFAULT_PARSER, OUTPUT_EXTENSIONS, generate_documents, get_component_catalog, render_job_document
+from talend_stream import generate_markdown_streaming
+from talend_zip_importer import ZIPS_DIR, import_zips
+from work_claims import WorkClaims
+
+DOC_DIR = 'documentations'
+MD_DIR = 'markdowns'
+ARCHIVES_DIR = 'archives'
+METRICS_DIR = 'metrics'
+MODELS_DIR = 'models'  # Cached model (JobDocument) of each converted job, to render the markdown again without the HTML
+FAILED_DIR = 'failed'  # Quarantine of the HTML files whose conversion failed, with the reason of each failure
+DEFAULT_FORMATS = ['md']
+
+def output_path_for(fname, md_dir=MD_DIR, fmt='md'):
+    """
+    Returns the path of the file generated in a given format ('md', 'json' or 'html') from an HTML file name.
+    """
+    base_name = os.path.splitext(fname)[0]
+    return os.path.join(md_dir, f'doc_{base_name}{OUTPUT_EXTENSIONS[fmt]}')
+
+def output_paths_for(fname, formats=DEFAULT_FORMATS, md_dir=MD_DIR):
+    """
+    Returns the paths of the files generated from an HTML file name, by output format.
+    """
+    return {fmt: output_path_for(fname, md_dir, fmt) for fmt in formats}
+
+def model_path_for(fname, models_dir=MODELS_DIR):
+    """
+    Returns the path of the cached model of the job of an HTML file name.
+    """
+    return os.path.join(models_dir, f'{os.path.splitext(fname)[0]}.json')
+
+def convert_file(fname, doc_dir=DOC_DIR, md_dir=MD_DIR, parser=None, profile=None, streaming=False, formats=DEFAULT_FORMATS,
+                 limits=None, history=None):
+    """
+    Generates the markdown file of one HTML file of doc_dir.
+    Runs in a worker process when the batch is parallel, so errors are returned instead of raised.
+    Args:
+        fname (str): Name of the HTML file in doc_dir.
+        doc_dir (str): Folder containing the HTML files.
+        md_dir (str): Folder where the markdown file is written.
+        parser (str, optional): Parser backend, 'lxml' or 'html.parser' (auto-detected if not given).
+        profile (dict, optional): Instrumentation settings ({'memory': bool}), None to disable it.
+        streaming (bool): Use the bounded-memory streaming conversion (see generate_markdown_streaming), markdown only.
+        formats (list): Output formats ('md', 'json', 'html'), all rendered from a single parse.
+        limits (dict, optional): Budgets of the conversion ({'timeout': seconds, 'memory_mb': MB}, see DocumentLimits),
+            None for no limit. Kernel limits are only added in worker processes.
+        history (dict, optional): Arguments of stat_history_files ({'rows': int, 'run': str}) to document the size,
+            modification time and last rows of the history files, None to list them only.
+    Returns:
+        dict: Result with keys 'fname', 'output' (file of the first format), 'outputs' (files of every format),
+        'status' ('ok' or 'failed'), 'error', 'reason' (cause of a failure: 'timeout', 'memory' or 'error'),
+        'facts' (facts extracted from the job, see JobDocument.facts; None on failure),
+        'dependencies' (signatures of the history files documented with history, see history_signatures),
+        'unknown_components' (component types without a description in composants.yaml)
+        and 'metrics' (span records of the conversion, empty when not profiling).
+    """
+    input_path = os.path.join(doc_dir, fname)
+    outputs = output_paths_for(fname, formats, md_dir)
+    output_path = outputs[formats[0]]
+    catalog = get_component_catalog()
+    catalog.pop_unknown()
+    if profile is not None:
+        instrumentation.enable(trace_memory=profile.get('memory', False))
+    result = {'fname': fname, 'output': output_path, 'outputs': list(outputs.values()), 'status': 'ok', 'error': None,
+              'reason': None, 'facts': None, 'dependencies': None}
+    try:
+        with DocumentLimits(**(limits or {}), hard=multiprocessing.parent_process() is not None):
+            if streaming:
+                # The streaming conversion keeps no model: drop the one of a previous conversion, now stale
+                if os.path.exists(model_path_for(fname)):
+                    os.remove(model_path_for(fname))
+                result['facts'] = generate_markdown_streaming(input_path, output_path, parser=parser, history=history)
+            else:
+                result['facts'] = generate_documents(input_path, outputs, parser=parser, model_path=model_path_for(fname),
+                                                       history=history)
+            if history is not None:
+                # Same rows and run as the conversion: the signatures of the state it documented, from the cache
+                result['dependencies'] = history_signatures([path for _, path in result['facts']['history_files']], **history)
+    except LimitExceeded as e:
+        result.update(status='failed', error=str(e), reason=e.reason)
+    except MemoryError:
+        result.update(status='failed', error="mémoire maximale dépassée", reason='memory')
+    except Exception as e:
+        result.update(status='failed', error=f"{type(e).__name__}: {e}", reason='error')
+    result['unknown_components'] = catalog.pop_unknown()
+    result['metrics'] = instrumentation.pop_records()
+    return result
+
+def archive_file(fname, doc_dir=DOC_DIR, archives_dir=ARCHIVES_DIR):
+    """
+    Moves a converted HTML file from doc_dir to the archive store of archives_dir (see ArchiveStore).
+    Returns:
+        str or None: None on success, else the error message.
+    """
+    try:
+        with instrumentation.span('archive', document=fname):
+            entry = ArchiveStore(archives_dir).store(os.path.join(doc_dir, fname))
+        print(f"Archivé {fname} dans {archives_dir}" + (" (contenu déjà archivé)" if entry['duplicate'] else ''))
+    except Exception as e:
+        print(f"Erreur lors de l'archivage de {fname}: {e}")
+        return str(e)
+    return None
+
+def quarantine_path(fname, failed_dir=FAILED_DIR):
+    """
+    Returns a path of failed_dir for a quarantined file that does not overwrite an earlier one: fname itself if free,
+    else fname suffixed with the date and time (e.g. job_20261018_093000.html), then with a counter.
+    """
+    stem, ext = os.path.splitext(fname)
+    path = os.path.join(failed_dir, fname)
+    if not os.path.exists(path):
+        return path
+    stem = f"{stem}_{time.strftime('%Y%m%d_%H%M%S')}"
+    path = os.path.join(failed_dir, stem + ext)
+    n = 1
+    while os.path.exists(path):
+        n += 1
+        path = os.path.join(failed_dir, f"{stem}_{n}{ext}")
+    return path
+
+def quarantine_file(result, doc_dir=DOC_DIR, failed_dir=FAILED_DIR):
+    """
+    Moves an HTML file whose conversion failed from doc_dir to failed_dir, so that it is not retried with every batch,
+    and records the reason of the failure in failed_dir/failures.jsonl.
+    An earlier failed file of the same name is kept: the new one is then renamed (see quarantine_path).
+    Args:
+        result (dict): Failed result of the conversion (see convert_file).
+    """
+    fname = result['fname']
+    try:
+        os.makedirs(failed_dir, exist_ok=True)
+        path = quarantine_path(fname, failed_dir)
+        os.replace(os.path.join(doc_dir, fname), path)
+        entry = {'name': fname, 'file': os.path.basename(path), 'failed_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                 'reason': result['reason'], 'error': result['error']}
+        with open(os.path.join(failed_dir, 'failures.jsonl'), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        print(f"Mis en quarantaine : {fname} dans {path}")
+    except Exception as e:
+        print(f"Erreur lors de la mise en quarantaine de {fname}: {e}")
+
+def rerender_models(models_dir=MODELS_DIR, md_dir=MD_DIR, formats=DEFAULT_FORMATS):
+    """
+    Renders again the output files of every cached job model, without parsing any HTML
+    (e.g. after a change of the markdown layout).
+    Returns:
+        int: Number of models that could not be rendered.
+    """
+    fnames = sorted(f for f in os.listdir(models_dir) if f.endswith('.json')) if os.path.isdir(models_dir) else []
+    if not fnames:
+        print(f"Aucun modèle trouvé dans {models_dir}, aucune documentation régénérée.")
+        return 0
     os.makedirs(md_dir, exist_ok=True)
-    html_found = False
-    for fname in os.listdir(doc_dir):
-        if fname.lower().endswith('.html'):
-            html_found = True
-            input_path = os.path.join(doc_dir, fname)
-            base_name = os.path.splitext(fname)[0]
-            output_path = os.path.join(md_dir, f'doc_{base_name}.md')
-            print(f"Génération de {output_path} depuis {fname}")
-            generate_markdown(input_path, output_path)
-            archives_dir = 'archives'
-            os.makedirs(archives_dir, exist_ok=True)
-            html_dst = os.path.join(archives_dir, fname)
+    errors = 0
+    for fname in fnames:
+        try:
+            doc = JobDocument.load(os.path.join(models_dir, fname))
+            if doc is None:
+                print(f"Modèle {fname} d'une autre version, ignoré : reconvertir le fichier HTML du job")
+                errors += 1
+                continue
+            render_job_document(doc, output_paths_for(doc.source, formats, md_dir))
+        except Exception as e:
+            print(f"Erreur lors du rendu du modèle {fname}: {e}")
+            errors += 1
+    print(f"\n{len(fnames) - errors} documentation(s) régénérée(s) depuis {models_dir}, {errors} échec(s)")
+    return errors
+
+class WorkerPool:
+    """
+    Pool of worker processes converting documents, started again when one of its workers dies
+    (e.g. killed by a kernel limit, see DocumentLimits), so that the rest of the batch goes on.
+    """
+
+    def __init__(self, workers, initializer=None):
+        """
+        Args:
+            workers (int): Number of worker processes.
+            initializer (callable, optional): Called at the start of each worker process.
+        """
+        self.workers = workers
+        self.initializer = initializer
+        self.generation = 0  # Incremented at each restart
+        self.executor = ProcessPoolExecutor(max_workers=workers, initializer=initializer)
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        Schedules fn(*args, **kwargs) in a worker process; starts the pool again first if it is broken.
+        """
+        try:
+            return self.executor.submit(fn, *args, **kwargs)
+        except BrokenProcessPool:
+            self.restart(self.generation)
+            return self.executor.submit(fn, *args, **kwargs)
+
+    def restart(self, generation):
+        """
+        Replaces the broken pool of a generation by a new one (once, whatever the number of futures it broke).
+        """
+        if generation != self.generation:
+            return
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=self.initializer)
+        self.generation += 1
+
+    def shutdown(self):
+        self.executor.shutdown()
+
+PIPELINE_QUEUE_SIZE = 16  # HTML files imported ahead of the conversions before the import waits
+
+def run_pipeline(fnames, import_workers=None, jobs=1, manifest=None, force=False, parser=None, profile=None,
+                 streaming=False, index=None, queue_size=PIPELINE_QUEUE_SIZE, formats=DEFAULT_FORMATS, zip_names=None,
+                 executor=None, claims=None, zip_claims=None, limits=None, history_rows=None):
+    """
+    Converts HTML files of DOC_DIR as a staged pipeline: a feeder thread queues the given files then imports
+    the ZIP files of zips/ and queues each HTML file as soon as it is extracted, a pool of jobs processes
+    converts them, and the current thread finalizes each result (build manifest, job index, archiving)
+    as soon as its own conversion is done.
+    At most queue_size files are queued or being converted at once: beyond that the import waits (backpressure).
+    Args:
+        fnames (list): Names of HTML files already in DOC_DIR.
+        import_workers (int, optional): Number of ZIP files imported concurrently; None to skip the import.
+        jobs (int): Number of worker processes (1 converts in the current process).
+        manifest (BuildManifest, optional): Build cache; files whose build key is unchanged are not regenerated.
+        force (bool): Regenerate every file even if its build key is unchanged.
+        parser (str, optional): Parser backend, 'lxml' or 'html.parser' (auto-detected if not given).
+        profile (dict, optional): Instrumentation settings of the conversions ({'memory': bool}), None to disable it.
+        streaming (bool): Use the bounded-memory streaming conversion (see generate_markdown_streaming).
+        index (JobIndex, optional): Job index updated with the facts of each converted file;
+            files missing from it are regenerated even if their build key is unchanged.
+        queue_size (int): Maximum number of files queued or being converted.
+        formats (list): Output formats ('md', 'json', 'html'), all rendered from a single parse.
+        zip_names (list, optional): Names of the ZIP files of zips/ to import (all of them by default).
+        executor (WorkerPool, optional): Worker pool to use instead of starting one (it is left running).
+        claims (WorkClaims, optional): Claims of DOC_DIR shared with other instances (see work_claims.py): each file is
+            claimed before its conversion and skipped if another instance got it; files not archived are given back.
+        zip_claims (WorkClaims, optional): Claims of zips/ shared with other instances (see import_zips).
+        limits (dict, optional): Budgets of each conversion ({'timeout': seconds, 'memory_mb': MB}, see DocumentLimits);
+            conversions then run in worker processes even with jobs=1. A file whose worker dies is converted again alone,
+            and quarantined if it kills that worker too. Files whose conversion fails are moved to FAILED_DIR.
+        history_rows (int, optional): Document the size, modification time and this number of last rows of each history
+            file (see history_files.py), read once per run; None to list them only.
+    Returns:
+        tuple: Result dicts (see convert_file, status may also be 'unchanged') in the order the files were queued,
+        and the import reports (see import_zips).
+    """
+    events = queue.Queue()
+    slots = threading.Semaphore(max(queue_size, jobs))
+    # The state of the history files is cached per run: a new run token reads them again (e.g. at each batch of watch)
+    history = None if history_rows is None else {'rows': history_rows, 'run': f"{os.getpid()}-{time.monotonic_ns()}"}
+    # With the history statistics, a document is also regenerated when one of its history files changed
+    signatures = None if history is None else lambda paths: history_signatures(paths, run=history['run'])
+    import_reports = []
+
+    def feed(fname):
+        slots.acquire()
+        events.put(('html', fname))
+
+    def feeder():
+        try:
+            for fname in fnames:
+                feed(fname)
+            if import_workers is not None:
+                import_reports.extend(import_zips(dest=DOC_DIR, workers=import_workers, names=zip_names, claims=zip_claims,
+                                                  on_html=lambda path: feed(os.path.basename(path))))
+        finally:
+            events.put(('fed', None))
+
+    results = {}
+    keys = {}
+    running = set()
+    again = set()  # Files imported again while being converted
+    own_executor = executor is None and (jobs > 1 or bool(limits))
+    if own_executor:
+        executor = WorkerPool(jobs)
+    isolation = None  # Single worker pool converting alone, one after the other, the files whose worker died
+    suspects = deque()
+    isolated = None  # File being converted by the isolation pool
+    pending = {}  # Future -> (file name, pool, generation of the pool)
+    # Claimed files are converted and archived from the slot of this instance
+    source_dir = claims.slot if claims is not None else DOC_DIR
+
+    def start(fname):
+        if claims is not None and not claims.claim(fname):
+            print(f"Ignoré : {fname}, pris en charge par un autre processus")
+            if results.get(fname) is None:
+                del results[fname]
+            slots.release()
+            return
+        input_path = os.path.join(source_dir, fname)
+        outputs = output_paths_for(fname, formats)
+        output_path = outputs[formats[0]]
+        if manifest is not None:
+            keys[fname] = manifest.build_key(input_path)
+        elif index is not None:
+            keys[fname] = file_digest(input_path)
+        if manifest is not None and not force and all(manifest.is_up_to_date(keys[fname], p, signatures) for p in outputs.values()):
+            if index is None or index.is_indexed(os.path.splitext(fname)[0], keys[fname]):
+                print(f"Inchangé : {fname}, {output_path} n'est pas régénéré")
+                finish({'fname': fname, 'output': output_path, 'outputs': list(outputs.values()), 'status': 'unchanged', 'error': None,
+                        'reason': None, 'facts': None, 'unknown_components': [], 'metrics': []})
+                return
+        print(f"Génération de {', '.join(outputs.values())} depuis {fname}")
+        if executor is None:
+            finish(convert_file(fname, source_dir, parser=parser, profile=profile, streaming=streaming, formats=formats,
+                                limits=limits, history=history))
+            return
+        running.add(fname)
+        submit(fname, executor)
+
+    def submit(fname, pool):
+        future = pool.submit(convert_file, fname, source_dir, parser=parser, profile=profile, streaming=streaming,
+                             formats=formats, limits=limits, history=history)
+        pending[future] = (fname, pool, pool.generation)
+        future.add_done_callback(lambda f: events.put(('done', f)))
+
+    def isolate_next():
+        nonlocal isolation, isolated
+        if isolated is None and suspects:
+            if isolation is None:
+                isolation = WorkerPool(1, executor.initializer)
+            isolated = suspects.popleft()
+            submit(isolated, isolation)
+
+    def crashed(fname, pool):
+        if pool is isolation:
+            # Its worker died while converting it alone: this file is the culprit
+            return {'fname': fname, 'output': output_path_for(fname, fmt=formats[0]),
+                    'outputs': list(output_paths_for(fname, formats).values()), 'status': 'failed',
+                    'error': "processus de conversion arrêté (limite de temps processeur ou de mémoire du système)",
+                    'reason': 'crash', 'facts': None, 'unknown_components': [], 'metrics': []}
+        # Any of the files being converted may have killed the worker: convert each of them again, alone
+        print(f"Processus de conversion arrêté pendant la conversion de {fname}, nouvel essai seul")
+        suspects.append(fname)
+        return None
+
+    def finish(result):
+        fname = result['fname']
+        running.discard(fname)
+        if fname in again and claims is None:
+            # The file was replaced during its conversion: convert the new one instead of archiving it unconverted
+            again.discard(fname)
+            start(fname)
+            return
+        if result['status'] == 'failed':
+            print(f"Erreur lors de la génération de {result['output']} depuis {fname}: {result['error']}")
+            quarantine_file(result, source_dir)
+        else:
+            if manifest is not None and result['status'] == 'ok':
+                for output_path in result['outputs']:
+                    manifest.record(keys[fname], output_path, result.get('dependencies'))
+            if index is not None and result['facts'] is not None:
+                index.upsert(os.path.splitext(fname)[0], keys[fname], result['facts'], result['output'])
+            archive_error = archive_file(fname, source_dir)
+            if archive_error:
+                result = dict(result, status='failed', error=f"archivage : {archive_error}")
+        if claims is not None and os.path.exists(claims.path(fname)):
+            # Not archived: give the file back, it stays in DOC_DIR as without claims
+            claims.release(fname)
+        results[fname] = result
+        if fname in again:
+            # A new file of the same name arrived while the claimed one was converted: claim and convert it in turn
+            again.discard(fname)
+            start(fname)
+            return
+        slots.release()
+
+    threading.Thread(target=feeder, name='feeder', daemon=True).start()
+    feeding = True
+    try:
+        while feeding or running:
+            kind, value = events.get()
+            if kind == 'fed':
+                feeding = False
+            elif kind == 'html' and value in running:
+                again.add(value)
+                slots.release()
+            elif kind == 'html':
+                results.setdefault(value, None)  # Keep the results in queue order
+                start(value)
+            else:
+                fname, pool, generation = pending.pop(value)
+                if pool is isolation:
+                    isolated = None
+                try:
+                    result = value.result()
+                except BrokenProcessPool:
+                    pool.restart(generation)
+                    result = crashed(fname, pool)
+                isolate_next()
+                if result is not None:
+                    finish(result)
+    finally:
+        if own_executor:
+            executor.shutdown()
+        if isolation is not None:
+            isolation.shutdown()
+        if manifest is not None:
+            manifest.save()
+    return list(results.values()), import_reports
+
+WATCH_INTERVAL = 1.0  # Seconds between two polls of the watched folders
+
+def scan_dir(path, suffix):
+    """
+    Returns the (size, mtime in ns) of the files of path whose name ends with suffix, from a single os.scandir pass.
+    """
+    entries = {}
+    if not os.path.isdir(path):
+        return entries
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.name.lower().endswith(suffix) and entry.is_file():
+                st = entry.stat()
+                entries[entry.name] = (st.st_size, st.st_mtime_ns)
+    return entries
+
+class ArrivalWatcher:
+    """
+    Watches a folder for complete new files: a file is complete once its size and mtime are the same over two polls,
+    or its mtime is older than settle seconds (e.g. a file moved into the folder).
+    The folder is only scanned again when its own mtime changes or files are still being written,
+    so an idle poll costs a single stat.
+    """
+
+    def __init__(self, path, suffix, settle=WATCH_INTERVAL):
+        """
+        Args:
+            path (str): Folder to watch.
+            suffix (str): Lowercase extension of the files to watch (e.g. '.zip').
+            settle (float): Age, in seconds, from which a file is complete without a second poll.
+        """
+        self.path = path
+        self.suffix = suffix
+        self.settle = settle
+        self.dir_mtime = None
+        self.snapshot = {}  # Name -> (size, mtime) at the last scan
+        self.handled = {}  # Name -> (size, mtime) when it was last processed
+
+    def poll(self):
+        """
+        Returns the sorted names of the complete files not processed yet in their current state.
+        """
+        now = time.time()
+        try:
+            dir_mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return []
+        unsettled = any(self.handled.get(name) != stat for name, stat in self.snapshot.items())
+        # A folder modified within the settle delay is scanned anyway: its mtime may not have ticked yet
+        if dir_mtime == self.dir_mtime and not unsettled and now - dir_mtime / 1e9 > self.settle:
+            return []
+        self.dir_mtime = dir_mtime
+        current = scan_dir(self.path, self.suffix)
+        ready = []
+        for name, stat in current.items():
+            if self.handled.get(name) == stat:
+                continue
+            if self.snapshot.get(name) == stat or now - stat[1] / 1e9 >= self.settle:
+                ready.append(name)
+        self.snapshot = current
+        # Forget the files that left the folder, so that a new file with the same name is seen
+        self.handled = {name: stat for name, stat in self.handled.items() if name in current}
+        return sorted(ready)
+
+    def mark_handled(self, names):
+        """
+        Records the current state of files that were processed (converted, or failed and left in place),
+        so that they are only processed again if they change.
+        """
+        for name in names:
             try:
-                os.replace(input_path, html_dst)
-                print(f"Archivé {fname} dans {archives_dir}")
-            except Exception as e:
-                print(f"Erreur lors de l'archivage de {fname}: {e}")
-    if not html_found:
-        print(f"Aucun fichier .html trouvé dans {doc_dir}, aucune documentation générée.")
+                st = os.stat(os.path.join(self.path, name))
+            except FileNotFoundError:
+                continue
+            self.handled[name] = (st.st_size, st.st_mtime_ns)
+            self.snapshot[name] = self.handled[name]
+
+def warm_up():
+    """
+    Loads the component catalog and the filtering rules of the current process ahead of the first conversion.
+    """
+    get_component_catalog().descriptions()
+    get_rules()
+
+def init_watch_worker():
+    """
+    Initializer of the worker processes of watch: Ctrl+C is handled by the main process only.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    warm_up()
+
+def watch(interval=WATCH_INTERVAL, jobs=1, import_workers=4, report=None, **options):
+    """
+    Stays resident and converts the files dropped in documentations/ (and the ZIP files dropped in zips/)
+    as soon as they are complete, until interrupted with Ctrl+C.
+    The imported modules, the component catalog and the worker processes stay loaded between arrivals.
+    Args:
+        interval (float): Seconds between two polls.
+        jobs (int): Number of worker processes (1 converts in the current process).
+        import_workers (int, optional): Number of ZIP files imported concurrently; None not to watch zips/.
+        report (callable, optional): Called with the results and import reports of each batch.
+        **options: Other options of run_pipeline (manifest, force, parser, profile, streaming, index, formats, claims,
+            zip_claims, limits, history_rows).
+    """
+    warm_up()
+    docs = ArrivalWatcher(DOC_DIR, '.html', interval)
+    zips = ArrivalWatcher(ZIPS_DIR, '.zip', interval) if import_workers is not None else None
+    executor = WorkerPool(jobs, init_watch_worker) if jobs > 1 or options.get('limits') else None
+    print(f"Surveillance de {DOC_DIR}/" + (f" et {ZIPS_DIR}/" if zips else '') + f" toutes les {interval:g} s (Ctrl+C pour arrêter)")
+    try:
+        while True:
+            html_names = docs.poll()
+            zip_names = zips.poll() if zips is not None else []
+            if html_names or zip_names:
+                results, import_reports = run_pipeline(html_names, import_workers if zip_names else None, jobs,
+                                                       zip_names=zip_names, executor=executor, **options)
+                docs.mark_handled(html_names + [r['fname'] for r in results])
+                if zips is not None:
+                    zips.mark_handled(zip_names)
+                if report is not None:
+                    report(results, import_reports)
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("\nArrêt de la surveillance")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+def print_summary(results):
+    """
+    Prints the per-file success/failure summary of a batch.
+    """
+    counts = {status: sum(1 for r in results if r['status'] == status) for status in ['ok', 'unchanged', 'failed']}
+    print(f"\nRésumé : {counts['ok']} succès, {counts['unchanged']} inchangé(s), {counts['failed']} échec(s)")
+    labels = {'ok': 'OK', 'unchanged': 'INCHANGÉ', 'failed': 'ÉCHEC'}
+    for r in results:
+        if r['status'] == 'failed':
+            print(f"  {labels[r['status']]:<9}{r['fname']} : {r['error']}")
+        else:
+            print(f"  {labels[r['status']]:<9}{r['fname']} -> {r['output']}")
+    # Component types without a description, aggregated over the whole batch
+    unknown = {}
+    for r in results:
+        for comp_type in r.get('unknown_components', []):
+            unknown[comp_type] = unknown.get(comp_type, 0) + 1
+    if unknown:
+        print(f"\nComposants sans description dans composants.yaml ({len(unknown)}) :")
+        for comp_type in sorted(unknown):
+            print(f"  {comp_type} ({unknown[comp_type]} job(s))")
+
+def report_metrics(results, path, run_id, top=5):
+    """
+    Writes the span records of a batch (conversions and archiving) to a JSON-lines metrics file,
+    and prints the slowest documents of the batch.
+    """
+    records = [record for r in results for record in r.get('metrics', [])] + instrumentation.pop_records()
+    instrumentation.write_metrics(path, records, run_id)
+    print(f"\nMesures écrites dans {path} ({len(records)} enregistrement(s))")
+    documents = sorted((r for r in records if r['span'] == 'generate_markdown'), key=lambda r: r['wall_ms'], reverse=True)
+    if documents:
+        print("Documents les plus lents :")
+        for record in documents[:top]:
+            peak = f", pic mémoire {record['peak_kb']:.0f} Ko" if 'peak_kb' in record else ''
+            print(f"  {record['wall_ms']:>10.1f} ms  {record['document']} ({record.get('size_bytes', 0) / 1024:.0f} Ko{peak})")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Génère la documentation Markdown des jobs Talend.")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="Nombre de processus de conversion en parallèle (défaut : 1)")
+    parser.add_argument('--import-workers', type=int, default=4,
+                        help="Nombre d'archives ZIP importées en parallèle (défaut : 4)")
+    parser.add_argument('--force', action='store_true',
+                        help="Régénère tous les fichiers, même ceux inchangés depuis le dernier build")
+    parser.add_argument('--parser', choices=['lxml', 'html.parser'], default=None,
+                        help="Moteur d'analyse HTML (défaut : lxml s'il est installé, sinon html.parser)")
+    parser.add_argument('--streaming', action='store_true',
+                        help="Conversion section par section à mémoire bornée, pour les très gros exports")
+    parser.add_argument('--formats', default=','.join(DEFAULT_FORMATS),
+                        help="Formats générés, séparés par des virgules, à partir d'une seule analyse du HTML : "
+                             f"{', '.join(OUTPUT_EXTENSIONS)} (défaut : md)")
+    parser.add_argument('--rerender', action='store_true',
+                        help=f"Régénère les Markdown depuis les modèles de {MODELS_DIR}/, sans relire les HTML (après un changement de mise en page)")
+    parser.add_argument('--watch', action='store_true',
+                        help=f"Reste actif et convertit les fichiers déposés dans {ZIPS_DIR}/ et {DOC_DIR}/ dès qu'ils sont complets")
+    parser.add_argument('--watch-interval', type=float, default=WATCH_INTERVAL,
+                        help=f"Avec --watch, secondes entre deux examens des dossiers (défaut : {WATCH_INTERVAL:g})")
+    parser.add_argument('--timeout', type=float, default=DOCUMENT_TIMEOUT, metavar='SECONDES',
+                        help=f"Durée maximale de la conversion d'un fichier, au-delà il est mis en quarantaine dans {FAILED_DIR}/ "
+                             f"(défaut : {DOCUMENT_TIMEOUT}, 0 : sans limite)")
+    parser.add_argument('--max-memory', type=float, default=DOCUMENT_MEMORY_MB, metavar='MO',
+                        help=f"Mémoire maximale d'un processus de conversion, au-delà le fichier est mis en quarantaine "
+                             f"(défaut : {DOCUMENT_MEMORY_MB}, 0 : sans limite)")
+    parser.add_argument('--history-stats', nargs='?', type=int, const=HISTORY_PREVIEW_ROWS, default=None, metavar='LIGNES',
+                        help="Indique la taille, la date de modification et les dernières lignes de chaque fichier CSV "
+                             f"d'historique (défaut : {HISTORY_PREVIEW_ROWS} lignes, 0 : sans aperçu)")
+    parser.add_argument('--no-index', action='store_true',
+                        help=f"Ne pas mettre à jour l'index SQLite des jobs ({INDEX_PATH})")
+    parser.add_argument('--no-import', action='store_true',
+                        help="Ne pas importer les archives ZIP du dossier zips/")
+    parser.add_argument('--profile', nargs='?', const='', default=None, metavar='FICHIER',
+                        help="Mesure le temps de chaque étape et l'écrit au format JSON lines "
+                             f"(défaut : {METRICS_DIR}/metrics_<date>.jsonl)")
+    parser.add_argument('--profile-memory', action='store_true',
+                        help="Avec --profile, mesure aussi le pic mémoire de chaque étape (tracemalloc)")
+    args = parser.parse_args(argv)
+    formats = [fmt.strip() for fmt in args.formats.split(',') if fmt.strip()]
+    unknown = [fmt for fmt in formats if fmt not in OUTPUT_EXTENSIONS]
+    if unknown or not formats:
+        parser.error(f"format(s) inconnu(s) : {', '.join(unknown)} (formats disponibles : {', '.join(OUTPUT_EXTENSIONS)})")
+    if args.streaming and formats != ['md']:
+        parser.error("--streaming ne génère que le format md")
+    if args.jobs < 1:
+        parser.error("--jobs attend un nombre de processus supérieur ou égal à 1")
+    if args.import_workers < 1:
+        parser.error("--import-workers attend un nombre d'archives supérieur ou égal à 1")
+    if args.history_stats is not None and args.history_stats < 0:
+        parser.error("--history-stats attend un nombre de lignes positif ou nul")
+    if args.rerender:
+        return 1 if rerender_models(formats=formats) else 0
+    profile = None
+    if args.profile is not None:
+        run_id = time.strftime('%Y%m%d_%H%M%S')
+        metrics_path = args.profile or os.path.join(METRICS_DIR, f'metrics_{run_id}.jsonl')
+        profile = {'memory': args.profile_memory}
+        instrumentation.enable(trace_memory=args.profile_memory)
+    try:
+        get_rules()
+    except ValueError as e:
+        # Stop before converting anything rather than failing every document
+        print(e)
+        return 1
+    os.makedirs(DOC_DIR, exist_ok=True)
+    os.makedirs(MD_DIR, exist_ok=True)
+    import_workers = None if args.no_import else args.import_workers
+    # The parser backend and the history statistics change the generated files: outputs built with other ones are rebuilt
+    variant = f"parser:{args.parser or DEFAULT_PARSER}"
+    if args.history_stats is not None:
+        variant += f":history-stats:{args.history_stats}"
+    options = {'manifest': BuildManifest(variant=variant), 'force': args.force, 'parser': args.parser, 'profile': profile,
+               'streaming': args.streaming, 'formats': formats, 'history_rows': args.history_stats}
+    if args.timeout or args.max_memory:
+        # Each conversion runs in a worker process under these budgets, so that a pathological file cannot stall the batch
+        options['limits'] = {'timeout': args.timeout or None, 'memory_mb': args.max_memory or None}
+
+    def report(results, import_reports):
+        if import_reports:
+            imported = sum(len(r['html_files']) for r in import_reports)
+            failed = [r['zip'] for r in import_reports if r['error']]
+            print(f"Import : {len(import_reports)} archive(s), {imported} fichier(s) HTML, {len(failed)} échec(s)")
+        if results:
+            print_summary(results)
+            if profile is not None:
+                report_metrics(results, metrics_path, run_id)
+
+    index = None if args.no_index else JobIndex()
+    # Each file is claimed before being processed, so that several instances (on one or several machines sharing
+    # the folders) divide the files between them; the claims of crashed instances are recovered first
+    claims = WorkClaims(DOC_DIR).open()
+    zip_claims = WorkClaims(ZIPS_DIR).open() if import_workers is not None else None
+    options.update(claims=claims, zip_claims=zip_claims)
+    try:
+        if args.watch:
+            watch(args.watch_interval, args.jobs, import_workers, report, index=index, **options)
+            return 0
+        # Import the ZIP files of zips/ and convert each HTML file as soon as it is extracted
+        fnames = sorted(f for f in os.listdir(DOC_DIR) if f.lower().endswith('.html'))
+        results, import_reports = run_pipeline(fnames, import_workers, args.jobs, index=index, **options)
+    finally:
+        claims.close()
+        if zip_claims is not None:
+            zip_claims.close()
+        if index is not None:
+            index.close()
+    if not results:
+        report([], import_reports)
+        print(f"Aucun fichier .html trouvé dans {DOC_DIR}, aucune documentation générée.")
+        return 0
+    report(results, import_reports)
+    return 1 if any(r['status'] == 'failed' for r in results) else 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
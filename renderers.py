@@ -0,0 +1,147 @@
+import html
+import json
+import os
+import re
+import time
+from history_files import format_mtime, format_size
+
+# Renderers of a job document (see JobDocument) other than markdown (see render_markdown in talend_doc_cleaner.py).
+# Each one writes a whole document to an open text file: render(f, doc, composants_info).
+
+BR_PATTERN = re.compile(r'<br\s*/?>', re.IGNORECASE)
+# Start of a version entry of the connector history, e.g. "v1.0 07/05/2025"
+VERSION_ENTRY_PATTERN = re.compile(r'(?<!^)(?<!\n)(v\d+\.\d+\s+\d{2}/\d{2}/\d{4})')
+
+def format_historique_versions(historique):
+    """
+    Adds a line break before each new version (vX.X date) for display in the changelog/history.
+    """
+    # Clean possible <br> HTML tags and carriage returns
+    histo = BR_PATTERN.sub('\n', historique)
+    histo = histo.replace('\r','').replace('\n','')
+    # Add a line break before each pattern vX.X date (except at the start of the text)
+    histo = VERSION_ENTRY_PATTERN.sub(r'\n\1', histo)
+    return histo.strip()
+
+def render_json(f, doc, composants_info):
+    """
+    Writes the JSON feed of a job document, for the job catalog.
+    Args:
+        f (file object): The open file object to write to.
+        doc (JobDocument): Model of the job.
+        composants_info (dict or ComponentCatalog): Component descriptions from YAML.
+    """
+    component_types = []
+    for comp_type in doc.component_types:
+        desc = composants_info.get(comp_type, None) or {}
+        component_types.append({'type': comp_type, 'utilite': desc.get('utilite'), 'exemple': desc.get('exemple')})
+    feed = {
+        'job': os.path.splitext(doc.source)[0],
+        'source': doc.source,
+        'connector': doc.connector,
+        'component_types': component_types,
+        'components': [{'name': name, 'type': comp_type} for name, comp_type in doc.components.items()],
+        'o2t': [{'name': name, 'model': model, 'query': query} for name, model, query in doc.o2t],
+        'context': [{'name': p.name, 'value': p.value, 'used_by': p.used_by} for p in doc.context],
+        'history_files': [_history_entry(name, path, doc.history_stats.get(path)) for name, path in doc.history_files],
+        'sections': [{'title': s.title, 'text': '\n\n'.join(b for b in s.blocks if b.strip())} for s in doc.sections],
+    }
+    json.dump(feed, f, ensure_ascii=False, indent=1)
+    f.write('\n')
+
+def _history_entry(name, path, stats):
+    """
+    Returns the JSON entry of a history file, with its size, modification time and last rows if they were read.
+    """
+    entry = {'name': name, 'path': path}
+    if stats is not None:
+        modified = None if stats.mtime is None else time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(stats.mtime))
+        entry.update(size=stats.size, modified=modified, last_rows=stats.tail, error=stats.error)
+    return entry
+
+def _text(value):
+    """
+    Returns a value escaped for HTML, line breaks included.
+    """
+    return html.escape(value or '').replace('\n', '<br>\n')
+
+def render_html(f, doc, composants_info):
+    """
+    Writes a standalone HTML page of a job document, for the intranet, with the sections of the markdown documentation.
+    Args:
+        f (file object): The open file object to write to.
+        doc (JobDocument): Model of the job.
+        composants_info (dict or ComponentCatalog): Component descriptions from YAML.
+    """
+    info = doc.connector
+    name = info.get('nom') or os.path.splitext(doc.source)[0]
+    f.write('<!DOCTYPE html>\n<html lang="fr">\n<head>\n<meta charset="utf-8">\n')
+    f.write(f'<title>{_text(name)}</title>\n</head>\n<body>\n')
+    f.write(f'<h1>{_text(name)}</h1>\n')
+    # Connector description
+    f.write('<h2>Description du connecteur</h2>\n<dl>\n')
+    for label, key in [('Résumé', 'objectif'), ('Version', 'version'), ('Création', 'creation'), ('Modification', 'modification')]:
+        if (info.get(key) or '').strip():
+            f.write(f'<dt>{label}</dt><dd>{_text(info[key].strip())}</dd>\n')
+    f.write('</dl>\n')
+    historique = (info.get('historique') or '').strip()
+    if historique:
+        f.write('<p><strong>Historique :</strong></p>\n<ul>\n')
+        for line in format_historique_versions(historique).split('\n'):
+            if line.strip():
+                f.write(f'<li>{_text(line)}</li>\n')
+        f.write('</ul>\n')
+    # One2Team header
+    if doc.o2t:
+        f.write('<h2>En-tête One2Team</h2>\n<table>\n')
+        f.write('<tr><th>Nom unique</th><th>Modèle de fiche</th><th>Requête O2T / Type List</th></tr>\n')
+        for row in doc.o2t:
+            f.write('<tr>' + ''.join(f'<td>{_text(value)}</td>' for value in row) + '</tr>\n')
+        f.write('</table>\n')
+    for section in doc.sections:
+        title = section.title.strip()
+        if title.lower() == 'liste des composants':
+            f.write('<h2>Liste des composants</h2>\n<ul>\n')
+            for comp_type in doc.component_types:
+                f.write(f'<li><code>{_text(comp_type)}</code></li>\n')
+            f.write('</ul>\n<h2>Context Utilisé</h2>\n')
+            if doc.context:
+                f.write('<table>\n<tr><th>Paramètre</th><th>Valeur</th><th>Utilisé par</th></tr>\n')
+                for p in doc.context:
+                    f.write(f'<tr><td><code>{_text(p.name)}</code></td><td>{_text(p.value)}</td>'
+                            f'<td>{_text(", ".join(p.used_by))}</td></tr>\n')
+                f.write('</table>\n')
+            else:
+                f.write('<p><em>Aucun paramètre contextuel utilisé.</em></p>\n')
+            if doc.history_files:
+                f.write('<h2>Historique</h2>\n<ul>\n')
+                for nom, chemin in doc.history_files:
+                    f.write(f'<li><strong>{_text(nom)}</strong> : <code>{_text(chemin)}</code>')
+                    stats = doc.history_stats.get(chemin)
+                    if stats is not None and stats.error:
+                        f.write(f'<br><em>Fichier inaccessible : {_text(stats.error)}</em>')
+                    elif stats is not None:
+                        f.write(f'<br>{format_size(stats.size)}, modifié le {format_mtime(stats.mtime)}')
+                        if stats.tail:
+                            f.write(f'<pre>{html.escape(chr(10).join(stats.tail))}</pre>')
+                    f.write('</li>\n')
+                f.write('</ul>\n')
+        elif title.lower() in ['context utilisé', 'context utilise']:
+            # Rendered right after the component list
+            continue
+        elif title.lower() == 'description des composants':
+            f.write('<h2>Description des composants</h2>\n')
+            for comp_type in doc.component_types:
+                desc = composants_info.get(comp_type, None)
+                f.write(f'<h3>{_text(comp_type)}</h3>\n')
+                if desc:
+                    f.write(f'<p><strong>Utilité</strong> : {_text(desc.get("utilite", ""))}<br>\n'
+                            f'<strong>Exemple</strong> : {_text(desc.get("exemple", ""))}</p>\n')
+                else:
+                    f.write('<p><em>Description non renseignée dans le fichier de configuration.</em></p>\n')
+        else:
+            f.write(f'<h2>{_text(title)}</h2>\n')
+            for block in section.blocks:
+                if block.strip():
+                    f.write(f'<p>{_text(block)}</p>\n')
+    f.write('</body>\n</html>\n')
@@ -0,0 +1,193 @@
+import os
+import re
+import yaml
+
+# Optional rules file, next to composants.yaml: its entries are added to the default rules below
+RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "regles.yaml")
+
+# Sections whose title contains one of these keywords (case-insensitive) are left out of the documentation
+SECTIONS_TO_IGNORE = [
+    'Liste des contextes', 'Context List', 'ContexteDefault', 'ContextePROD',
+    'Context', 'context', 'Contexts', 'contexts',
+    'Paramètres supplémentaires', 'Statut & Logs', 'Prévisualiser l\'image',
+    'Propriétés', 'Valeurs', 'Nom', 'Langue', 'Statut',
+    'Exécution multi thread', 'tContextLoad implicite',
+    'Utiliser les statistiques (tStatCatcher)', 'Utiliser les logs (tLogCatcher)',
+    'Utiliser les volumes (tFlowMeterCatcher)', 'Dans la console',
+    'Dans des fichiers', 'Dans la base de données',
+    'Capturer les statistiques des composants', "Capturer les erreurs de l'exécutable",
+    "Capturer les erreurs de l'utilisateur", "Capturer les alertes à l'utilisateur"
+]
+
+# Section titles (lowercase) rendered elsewhere, or not at all, by generate_markdown
+SECTIONS_NOT_RENDERED = ['description du connecteur', 'en-tête one2team', 'description du projet', 'description', 'résumé', 'paramètres', 'code source']
+
+# Content nodes of a section with a CSS class containing one of these keywords are left out of it
+CLASSES_TO_IGNORE = ['context']
+
+# CSV files whose path (or link text) contains one of these keywords are listed in the Historique section
+HISTORY_KEYWORDS = ['histo', 'historique', 'suivi']
+
+# Context parameters whose name contains one of these keywords are documented without their value
+HIDDEN_CONTEXT_VALUES = ['o2t', 'password']
+
+# Rule categories: name -> (default entries, True if an entry must match the whole text rather than part of it)
+RULE_CATEGORIES = {
+    'ignored_sections': (SECTIONS_TO_IGNORE, False),
+    'not_rendered_sections': (SECTIONS_NOT_RENDERED, True),
+    'ignored_classes': (CLASSES_TO_IGNORE, False),
+    'history_keywords': (HISTORY_KEYWORDS, False),
+    'hidden_context_values': (HIDDEN_CONTEXT_VALUES, False),
+}
+
+def _trie_pattern(words, whole=False):
+    """
+    Returns a regex matching any of the words, with their common prefixes factored out (e.g. 'context' and 'contexts'
+    give 'context(?:s)?'), so that the regex engine follows a single branch per character instead of trying
+    every word at every position: the matching cost stays flat as the word list grows.
+    Args:
+        words (iterable): Words to match.
+        whole (bool): False when only the presence of a word matters: a word then makes the longer words
+            starting with it redundant, and they are dropped.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def build(node):
+        if '' in node and not whole:
+            return ''
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        alternation = branches[0] if len(branches) == 1 and '' not in node else '(?:' + '|'.join(branches) + ')'
+        return alternation + '?' if '' in node else alternation
+
+    return build(trie)
+
+class KeywordMatcher:
+    """
+    Case-insensitive matcher of a list of keywords and regular expressions. The keywords are compiled once into
+    a single regex; each regular expression is compiled on its own, so that it may start with inline flags (e.g. (?s)).
+    """
+
+    def __init__(self, keywords=(), patterns=(), whole=False):
+        """
+        Args:
+            keywords (iterable): Keywords looked for in the text (or equal to the whole text if whole).
+            patterns (iterable): Regular expressions looked for in the text (or matching the whole text if whole).
+            whole (bool): Match the whole text instead of any part of it.
+        Raises:
+            ValueError: If one of the regular expressions is invalid.
+        """
+        keywords = sorted({k.lower() for k in keywords if k})
+        self.keywords = keywords
+        self.patterns = list(patterns)
+        regexes = [re.compile(_trie_pattern(keywords, whole))] if keywords else []
+        for pattern in self.patterns:
+            try:
+                regexes.append(re.compile(pattern, re.IGNORECASE))
+            except (re.error, TypeError) as e:
+                raise ValueError(f"expression régulière invalide {pattern!r} : {e}") from None
+        self._matches = [regex.fullmatch if whole else regex.search for regex in regexes]
+
+    def __call__(self, text):
+        """
+        Returns True if the text (compared in lowercase) matches one of the keywords or regular expressions.
+        """
+        text = text.lower()
+        for match in self._matches:
+            if match(text) is not None:
+                return True
+        return False
+
+class RuleSet:
+    """
+    Filtering rules of the documentation, each category compiled into a KeywordMatcher:
+    ignored_sections, not_rendered_sections, ignored_classes, history_keywords and hidden_context_values
+    (see RULE_CATEGORIES).
+    """
+
+    def __init__(self, extra=None):
+        """
+        Args:
+            extra (dict, optional): Entries added to the default rules, by category: keywords (str)
+                or regular expressions ({'regex': str}).
+        Raises:
+            ValueError: If a category is unknown or one of its entries is invalid; the message names it.
+        """
+        extra = extra or {}
+        unknown = [name for name in extra if name not in RULE_CATEGORIES]
+        if unknown:
+            raise ValueError(f"catégorie de règles inconnue {unknown[0]!r} (catégories : {', '.join(RULE_CATEGORIES)})")
+        for name, (defaults, whole) in RULE_CATEGORIES.items():
+            entries = extra.get(name) or []
+            if not isinstance(entries, list):
+                raise ValueError(f"{name} : liste de règles attendue, pas {entries!r}")
+            keywords = list(defaults)
+            patterns = []
+            for entry in entries:
+                if isinstance(entry, str):
+                    keywords.append(entry)
+                elif isinstance(entry, dict) and isinstance(entry.get('regex'), str):
+                    patterns.append(entry['regex'])
+                else:
+                    raise ValueError(f"{name} : règle invalide {entry!r} (mot-clé ou {{regex: ...}} attendu)")
+            try:
+                setattr(self, name, KeywordMatcher(keywords, patterns, whole))
+            except ValueError as e:
+                raise ValueError(f"{name} : {e}") from None
+
+def load_rules(path=RULES_PATH):
+    """
+    Loads the rules of a YAML file, added to the default rules (see regles.yaml for the format).
+    Returns:
+        RuleSet: Default rules, extended by those of the file if it exists.
+    Raises:
+        ValueError: If the file cannot be read, or is not a mapping of categories to valid entries;
+            the message names the file and the bad entry.
+    """
+    if not os.path.exists(path):
+        return RuleSet()
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = yaml.safe_load(f)
+    except (OSError, yaml.YAMLError) as e:
+        raise ValueError(f"Règles {path} illisibles : {e}") from None
+    if data is None:
+        return RuleSet()
+    if not isinstance(data, dict):
+        raise ValueError(f"Règles {path} invalides : catégories de règles attendues, pas {data!r}")
+    try:
+        return RuleSet(data)
+    except ValueError as e:
+        raise ValueError(f"Règles {path} invalides : {e}") from None
+
+_rules = {}
+
+def get_rules(path=RULES_PATH):
+    """
+    Returns the process-wide RuleSet of a rules file, compiled once and compiled again only when the file changes.
+    If the file becomes invalid, the error is reported once and the rules loaded before are kept.
+    Raises:
+        ValueError: If the file is invalid and no rules were loaded from it before (see load_rules).
+    """
+    try:
+        st = os.stat(path)
+        signature = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        signature = None
+    cached = _rules.get(path)
+    if cached is None or cached[0] != signature:
+        try:
+            rules = load_rules(path)
+        except ValueError as e:
+            if cached is None:
+                raise
+            print(f"{e} ; les règles précédentes sont conservées")
+            rules = cached[1]
+        cached = _rules[path] = (signature, rules)
+    return cached[1]
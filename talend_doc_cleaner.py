@@ -1,65 +1,84 @@
+import contextlib
+import hashlib
+import io
+import json
 import os
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer, Tag
 import re
 import yaml
+import instrumentation
+from history_files import format_mtime, format_size, stat_history_files
+from job_document import ContextParam, JobDocument, Section
+from renderers import format_historique_versions, render_html, render_json
+# The default rules stay importable from here
+from rules import HISTORY_KEYWORDS, SECTIONS_NOT_RENDERED, SECTIONS_TO_IGNORE, get_rules  # noqa: F401
 
+GENERATOR_VERSION = '1.2'
+COMPOSANTS_YAML_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "composants.yaml")
+# Precompiled JSON copy of composants.yaml, keyed by the YAML file hash (skips the PyYAML loader on cold starts)
+COMPOSANTS_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".composants.cache.json")
 
-def format_historique_versions(historique):
-    """
-    Adds a line break before each new version (vX.X date) for display in the changelog/history.
-    """
-    # Clean possible <br> HTML tags and carriage returns
-    histo = re.sub(r'<br\s*/?>', '\n', historique, flags=re.IGNORECASE)
-    histo = histo.replace('\r','').replace('\n','')
-    # Add a line break before each pattern vX.X date (except at the start of the text)
-    histo = re.sub(r'(?<!^)(?<!\n)(v\d+\.\d+\s+\d{2}/\d{2}/\d{4})', r'\n\1', histo)
-    return histo.strip()
-
-SECTIONS_TO_IGNORE = [
-    'Liste des contextes', 'Context List', 'ContexteDefault', 'ContextePROD',
-    'Context', 'context', 'Contexts', 'contexts',
-    'Paramètres supplémentaires', 'Statut & Logs', 'Prévisualiser l\'image',
-    'Propriétés', 'Valeurs', 'Nom', 'Langue', 'Statut',
-    'Exécution multi thread', 'tContextLoad implicite',
-    'Utiliser les statistiques (tStatCatcher)', 'Utiliser les logs (tLogCatcher)',
-    'Utiliser les volumes (tFlowMeterCatcher)', 'Dans la console',
-    'Dans des fichiers', 'Dans la base de données',
-    'Capturer les statistiques des composants', "Capturer les erreurs de l'exécutable",
-    "Capturer les erreurs de l'utilisateur", "Capturer les alertes à l'utilisateur"
-]
+# Parser backend: lxml when installed (much faster), the standard library html.parser otherwise
+try:
+    import lxml  # noqa: F401
+    DEFAULT_PARSER = 'lxml'
+except ImportError:
+    DEFAULT_PARSER = 'html.parser'
+
+def parse_html(markup, parser=None, parse_only=None):
+    """
+    Parses HTML with the selected BeautifulSoup backend.
+    Args:
+        markup (str): HTML content to parse.
+        parser (str, optional): 'lxml' or 'html.parser'; DEFAULT_PARSER if not given.
+        parse_only (SoupStrainer, optional): Restricts parsing to the matching tags and their content.
+    Returns:
+        BeautifulSoup: Parsed HTML soup object.
+    """
+    return BeautifulSoup(markup, parser or DEFAULT_PARSER, parse_only=parse_only)
 
 ANCHORS_TO_IGNORE = [
     'Context List', 'ContexteDefault', 'ContextePROD', 'Context', 'context', 'Contexts', 'contexts', 'Prévisualiser l\'image'
 ]
 
-def is_context_section(title):
+def is_context_section(title, rules=None):
     """
     Checks if a given section title should be ignored based on predefined keywords.
     Args:
         title (str): The section title to check.
+        rules (RuleSet, optional): Filtering rules (see rules.py), the process-wide ones if not given.
     Returns:
         bool: True if the title matches any ignored keyword, False otherwise.
     """
-    return any(kw.lower() in title.lower() for kw in SECTIONS_TO_IGNORE)
+    return (rules or get_rules()).ignored_sections(title)
 
-def extract_sections(soup):
+def is_rendered_section(title, rules=None):
+    """
+    Returns False for the sections rendered elsewhere, or not at all, by render_markdown (see SECTIONS_NOT_RENDERED).
+    """
+    return not (rules or get_rules()).not_rendered_sections(title.strip())
+
+def extract_sections(soup, rules=None):
     """
     Extracts all top-level sections from the HTML soup, skipping those identified as context sections.
     Returns a list of dictionaries, each with keys 'title' and 'content'.
-    'title' is the section header, 'content' is a list of HTML strings belonging to the section.
+    'title' is the section header, 'content' is a list of the parsed nodes (tags and strings) belonging to the section,
+    referenced in the soup rather than serialized, so that they are never parsed again.
+    The filtering rules (see rules.py) are the process-wide ones if not given.
     """
+    rules = rules or get_rules()
     output = []
     for h2 in soup.find_all('h2'):
         title = h2.get_text(strip=True)
-        if is_context_section(title):
+        if rules.ignored_sections(title):
             continue
         section_content = []
         for sibling in h2.next_siblings:
             if sibling.name == 'h2':
                 break
-            if sibling.name and sibling.get('class') and any('context' in c for c in sibling.get('class')):
+            if sibling.name and sibling.get('class') and any(rules.ignored_classes(c) for c in sibling.get('class')):
                 continue
-            section_content.append(str(sibling))
+            section_content.append(sibling)
         if section_content:
             output.append({'title': title, 'content': section_content})
     return output
@@ -79,26 +98,42 @@ def extract_unique_components(soup):
             # Find the table immediately after the header
             table = h2.find_next('table')
             if table:
-                for row in table.find_all('tr')[1:]:  # skip header
-                    cols = row.find_all('td')
-                    if len(cols) >= 2:
-                        comp_type = cols[1].get_text(strip=True)
-                        unique_types.add(comp_type)
+                unique_types.update(component_types_from_table(table))
             break
     return sorted(unique_types)
 
+def component_types_from_table(table):
+    """
+    Returns the set of component types (second column) of the component list table, header row excluded.
+    """
+    unique_types = set()
+    for row in table.find_all('tr')[1:]:  # skip header
+        cols = row.find_all('td')
+        if len(cols) >= 2:
+            unique_types.add(cols[1].get_text(strip=True))
+    return unique_types
+
 
-def html_to_markdown(html):
+def html_to_markdown(html, parser=None):
     """
     Converts HTML content to plain markdown-like text by extracting visible text.
     Args:
-        html (str): HTML content as a string.
+        html (Tag or str): Parsed node of the document, or HTML content as a string.
+        parser (str, optional): Parser backend (see parse_html), only used for HTML strings.
     Returns:
         str: Extracted plain text from the HTML.
     Note:
         This is a simple conversion and can be improved using markdownify or similar libraries if needed.
     """
-    text = BeautifulSoup(html, 'html.parser').get_text(separator='\n', strip=True)
+    if isinstance(html, Tag):
+        # Parsed node: read its text directly from the live tree
+        return html.get_text(separator='\n', strip=True)
+    if not html.strip():
+        return ''
+    if '<' not in html and '&' not in html:
+        # Plain text (e.g. a string node between two tags): nothing to parse
+        return html.strip()
+    text = parse_html(html, parser).get_text(separator='\n', strip=True)
     return text
 
 
@@ -117,11 +152,115 @@ def load_composant_descriptions(yaml_path="composants.yaml"):
         print(f"Error while reading YAML file: {e}")
         return {}
 
-def parse_connector_info(sections):
+class ComponentCatalog:
+    """
+    Component descriptions of composants.yaml, loaded once per process and reloaded only when the file changes.
+    Can be used in place of the descriptions dict: get() also records the component types without a description.
+    The file is only checked by refresh(), once per document, so that lookups never touch the file system.
+    """
+
+    def __init__(self, yaml_path=COMPOSANTS_YAML_PATH, cache_path=COMPOSANTS_CACHE_PATH):
+        """
+        Args:
+            yaml_path (str): Path to the YAML file containing component descriptions.
+            cache_path (str or None): Path to the precompiled JSON cache, or None to disable it.
+        """
+        self.yaml_path = yaml_path
+        self.cache_path = cache_path
+        self._descriptions = {}
+        self._signature = None
+        self._loaded = False
+        self.unknown = {}
+
+    def refresh(self):
+        """
+        Reloads the descriptions if the YAML file changed (mtime or size) since they were loaded.
+        Returns:
+            ComponentCatalog: self.
+        """
+        try:
+            st = os.stat(self.yaml_path)
+            signature = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            signature = None
+        if signature != self._signature:
+            self._descriptions = self._load() if signature else load_composant_descriptions(self.yaml_path)
+            self._signature = signature
+        self._loaded = True
+        return self
+
+    def descriptions(self):
+        """
+        Returns the component descriptions dict, reloading it if the YAML file changed (see refresh).
+        """
+        return self.refresh()._descriptions
+
+    def _load(self):
+        """
+        Loads the descriptions from the precompiled cache when its hash matches the YAML file, else from the YAML file.
+        """
+        with open(self.yaml_path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        if self.cache_path:
+            try:
+                with open(self.cache_path, 'r', encoding='utf-8') as f:
+                    cache = json.load(f)
+                if cache.get('sha256') == digest:
+                    return cache['descriptions']
+            except (OSError, ValueError, KeyError):
+                pass
+        descriptions = load_composant_descriptions(self.yaml_path) or {}
+        if self.cache_path and descriptions:
+            tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump({'sha256': digest, 'descriptions': descriptions}, f, ensure_ascii=False)
+                os.replace(tmp_path, self.cache_path)
+            except (OSError, TypeError) as e:
+                print(f"Cache du catalogue des composants non écrit : {e}")
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        return descriptions
+
+    def get(self, comp_type, default=None):
+        """
+        Returns the description of a component type, recording it as unknown if it has none.
+        The descriptions are those of the last refresh (loaded on first use).
+        """
+        if not self._loaded:
+            self.refresh()
+        desc = self._descriptions.get(comp_type)
+        if desc is None:
+            self.unknown[comp_type] = self.unknown.get(comp_type, 0) + 1
+            return default
+        return desc
+
+    def pop_unknown(self):
+        """
+        Returns the sorted component types looked up without a description since the last call, and resets them.
+        """
+        unknown = sorted(self.unknown)
+        self.unknown = {}
+        return unknown
+
+_catalogs = {}
+
+def get_component_catalog(yaml_path=COMPOSANTS_YAML_PATH):
+    """
+    Returns the process-wide ComponentCatalog of a YAML file.
+    """
+    if yaml_path not in _catalogs:
+        _catalogs[yaml_path] = ComponentCatalog(yaml_path)
+    return _catalogs[yaml_path]
+
+DESCRIPTION_ROWS_STRAINER = SoupStrainer('tr')
+
+def parse_connector_info(sections, parser=None):
     """
     Extracts connector metadata from the 'Description' section.
     Args:
-        sections (list): List of section dictionaries, each with 'title' and 'content'.
+        sections (list): List of section dictionaries, each with 'title' and 'content' (parsed nodes or HTML strings).
+        parser (str, optional): Parser backend (see parse_html), only used for HTML strings.
     Returns:
         dict: Dictionary containing connector metadata fields such as name, version, objective, etc.
     Behavior:
@@ -133,8 +272,13 @@ def parse_connector_info(sections):
     info = {'nom': '', 'version': '', 'historique': '', 'creation': '', 'modification': '', 'description': '', 'objectif': ''}
     if desc_section:
         for content in desc_section['content']:
-            soup_desc = BeautifulSoup(content, 'html.parser')
-            rows = soup_desc.find_all('tr')
+            if isinstance(content, Tag):
+                rows = ([content] if content.name == 'tr' else []) + content.find_all('tr')
+            elif '<' in content:
+                # HTML string: only the table rows are needed, parse nothing else
+                rows = parse_html(content, parser, parse_only=DESCRIPTION_ROWS_STRAINER).find_all('tr')
+            else:
+                rows = []
             for row in rows:
                 cols = row.find_all(['td', 'th'])
                 if len(cols) == 2:
@@ -187,9 +331,107 @@ def write_connector_description(f, info):
         f.write("(Aucun historique trouvé)\n")
     f.write("\n")
 
+CONTEXT_REFERENCE_PATTERN = re.compile(r'context\.([a-zA-Z0-9_]+)')
+CONTEXT_MARKER_PATTERN = re.compile(r'Contexte([A-Za-z0-9_]+)')
+# Text of a marker table once its markers are removed: a table holding anything else is not a marker table
+MARKER_TABLE_REST_PATTERN = re.compile(r'\w')
+
+class ContextResolver:
+    """
+    Holds the name -> value map of every context table (ContextePROD, ContexteDefault, ...) of a document.
+    Built once per document with a single walk over its tables, then shared by every lookup and substitution.
+    """
+    DEFAULT_CONTEXT = 'PROD'
+
+    def __init__(self, contexts=None):
+        """
+        Args:
+            contexts (dict): Mapping of context name (e.g. 'PROD') to a dict of variable name -> value.
+        """
+        self.contexts = contexts or {}
+        # Context names whose marker was seen, waiting for their Nom/Valeur table, in document order
+        self._pending = []
+
+    @classmethod
+    def from_soup(cls, soup):
+        """
+        Builds the resolver from a parsed HTML soup.
+        'Contexte<Name>' markers and tables with 'Nom' and 'Valeur' headers are read in document order,
+        each marker being bound to the first such table after it not already bound to an earlier marker.
+        Markers are only read from tables holding nothing else than markers; layout tables (tables containing
+        other tables) are skipped.
+        Args:
+            soup (BeautifulSoup): Parsed HTML soup object.
+        Returns:
+            ContextResolver: Resolver holding the values of every context found.
+        """
+        return cls().update(soup)
+
+    def update(self, soup):
+        """
+        Adds the contexts of a soup, which may be one fragment of a document parsed piece by piece, in document order:
+        a marker table at the end of a fragment is bound to the first Nom/Valeur table of the next fragments.
+        Returns:
+            ContextResolver: self.
+        """
+        for table in soup.find_all('table'):
+            if table.find('table') is not None:
+                # Layout table: its markers and values are read from the tables it contains
+                continue
+            if self._pending:
+                headers = [th.get_text(strip=True).lower() for th in table.find_all('th')]
+                if 'nom' in headers and 'valeur' in headers:
+                    idx_nom = headers.index('nom')
+                    idx_valeur = headers.index('valeur')
+                    values = {}
+                    for tr in table.find_all('tr'):
+                        tds = tr.find_all('td')
+                        if len(tds) > max(idx_nom, idx_valeur):
+                            values[tds[idx_nom].get_text(strip=True)] = tds[idx_valeur].get_text(strip=True)
+                    self.contexts[self._pending.pop(0)] = values
+            if table.find(string=CONTEXT_MARKER_PATTERN) is None:
+                continue
+            text = table.get_text(' ', strip=True)
+            if MARKER_TABLE_REST_PATTERN.search(CONTEXT_MARKER_PATTERN.sub('', text)):
+                # Other text around the marker (e.g. a ContexteFichier.csv parameter value): not a marker table
+                continue
+            for name in CONTEXT_MARKER_PATTERN.findall(text):
+                if name not in self.contexts and name not in self._pending:
+                    self._pending.append(name)
+        return self
+
+    def values(self, context=DEFAULT_CONTEXT):
+        """
+        Returns the name -> value map of a context, or an empty dict if the context is unknown.
+        """
+        return self.contexts.get(context, {})
+
+    def get(self, context_name, context=DEFAULT_CONTEXT):
+        """
+        Returns the value of a context variable, or None if it is not defined in the given context.
+        """
+        return self.values(context).get(context_name)
+
+    def substitute(self, expr, context=DEFAULT_CONTEXT):
+        """
+        Substitutes each context.<name> in expr with its value, in a single regex pass,
+        then strips the Java string concatenation characters and whitespace.
+        Args:
+            expr (str): The expression to substitute context variables in.
+            context (str): Name of the context to take values from.
+        Returns:
+            str: The expression with context variables substituted.
+        """
+        values = self.values(context)
+        expr = CONTEXT_REFERENCE_PATTERN.sub(lambda m: values.get(m.group(1), m.group(0)), expr)
+        expr = expr.replace('+', '').replace('"', '').replace("'", '').strip()
+        expr = WHITESPACE_PATTERN.sub('', expr)
+        return expr
+
 def get_context_value_from_table(soup, context_name):
     """
     Searches for the value of a given context variable in the ContextePROD table of the HTML soup.
+    Prefer building a ContextResolver once when looking up several variables.
 
     Args:
         soup (BeautifulSoup): Parsed HTML soup object.
@@ -198,33 +440,12 @@ def get_context_value_from_table(soup, context_name):
     Returns:
         str or None: The value of the context variable if found, otherwise None.
     """
-    # Search for the table associated with ContextePROD
-    context_prod_found = False
-    tables = soup.find_all('table')
-    for idx, table in enumerate(tables):
-        # Check if this table contains the mention 'ContextePROD'
-        if table.find(string=lambda t: t and 'ContextePROD' in t):
-            context_prod_found = True
-            # Look for the next table with columns 'Nom' and 'Valeur'
-            for next_table in tables[idx+1:]:
-                headers = [th.get_text(strip=True).lower() for th in next_table.find_all('th')]
-                if 'nom' in headers and 'valeur' in headers:
-                    idx_nom = headers.index('nom')
-                    idx_valeur = headers.index('valeur')
-                    for tr in next_table.find_all('tr'):
-                        tds = tr.find_all('td')
-                        if len(tds) > max(idx_nom, idx_valeur):
-                            nom = tds[idx_nom].get_text(strip=True)
-                            valeur = tds[idx_valeur].get_text(strip=True)
-                            if nom == context_name:
-                                return valeur
-                    break  # Only look for one context prod table
-            break  # Only look for one ContextePROD
-    return None
+    return ContextResolver.from_soup(soup).get(context_name)
 
 def substitute_context_vars(expr, soup):
     """
     Substitute each context.<name> in expr with its value from the ContextePROD table.
+    Prefer building a ContextResolver once when substituting several expressions.
     
     Args:
         expr (str): The expression to substitute context variables in.
@@ -233,34 +454,169 @@ def substitute_context_vars(expr, soup):
     Returns:
         str: The expression with context variables substituted.
     """
-    import re
-    # Search for the context prod table (ContextePROD)
-    context_prod = {}
-    tables = soup.find_all('table')
-    for idx, table in enumerate(tables):
-        if table.find(string=lambda t: t and 'ContextePROD' in t):
-            for next_table in tables[idx+1:]:
-                headers = [th.get_text(strip=True).lower() for th in next_table.find_all('th')]
-                if 'nom' in headers and 'valeur' in headers:
-                    idx_nom = headers.index('nom')
-                    idx_valeur = headers.index('valeur')
-                    for tr in next_table.find_all('tr'):
-                        tds = tr.find_all('td')
-                        if len(tds) > max(idx_nom, idx_valeur):
-                            nom_var = tds[idx_nom].get_text(strip=True)
-                            valeur_var = tds[idx_valeur].get_text(strip=True)
-                            context_prod[nom_var] = valeur_var
-                    break
-            break
-    matches = re.findall(r'context\.([a-zA-Z0-9_]+)', expr)
-    for var in matches:
-        if var in context_prod:
-            expr = re.sub(r'context\.' + re.escape(var), lambda m: context_prod[var], expr)
-    expr = expr.replace('+', '').replace('"', '').replace("'", '').strip()
-    expr = re.sub(r'\s+', '', expr)
-    return expr
+    return ContextResolver.from_soup(soup).substitute(expr)
+
+COMPONENT_TYPE_PATTERN = re.compile(r'^(.+?)_\d+$')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+class ComponentIndex:
+    """
+    Index of the component parameter tables of a document, keyed by their "Nom unique".
+    Built once per document with a single scan over its tables.
+    """
+
+    def __init__(self, params_by_name=None, name_by_table=None):
+        """
+        Args:
+            params_by_name (dict): Mapping of component unique name to a dict of parameter -> value.
+            name_by_table (dict, optional): Mapping of id() of each parameter table of the soup to its unique name.
+        """
+        self.params_by_name = {}
+        self.name_by_table = name_by_table or {}
+        self.names_by_type = {}
+        for name, params in (params_by_name or {}).items():
+            self._add(name, params)
+
+    def _add(self, name, params):
+        self.params_by_name[name] = params
+        self.names_by_type.setdefault(component_type(name), []).append(name)
+
+    @classmethod
+    def from_soup(cls, soup):
+        """
+        Builds the index from a parsed HTML soup.
+        A table is a component parameter table if one of its rows has a "Nom unique" key;
+        the first table found for a given unique name wins.
+        Args:
+            soup (BeautifulSoup): Parsed HTML soup object.
+        Returns:
+            ComponentIndex: Index of every component parameter table found.
+        """
+        return cls().update(soup)
+
+    def update(self, soup):
+        """
+        Adds the component parameter tables of a soup, which may be one fragment of a document parsed piece by piece.
+        name_by_table is reset to the tables of this soup, as table ids are only meaningful while it is alive.
+        Returns:
+            ComponentIndex: self.
+        """
+        self.name_by_table = {}
+        for table in soup.find_all('table'):
+            nom_unique = None
+            params = {}
+            for row in table.find_all('tr'):
+                cols = row.find_all(['td', 'th'])
+                if len(cols) >= 2:
+                    cle = cols[0].get_text(strip=True)
+                    val = cols[1].get_text(strip=True)
+                    params[cle] = val
+                    if 'nom unique' in cle.lower():
+                        nom_unique = val
+            if nom_unique:
+                self.name_by_table[id(table)] = nom_unique
+                if nom_unique not in self.params_by_name:
+                    self._add(nom_unique, params)
+        return self
+
+    def get(self, name):
+        """
+        Returns the parameters of a component by unique name, or an empty dict if it has no parameter table.
+        """
+        return self.params_by_name.get(name, {})
+
+    def names_of_type(self, comp_type):
+        """
+        Returns the unique names of the indexed components of a given type (e.g. tFileOutputDelimited).
+        """
+        return self.names_by_type.get(comp_type, [])
+
+    def find_param(self, name, keyword):
+        """
+        Returns the value of the last parameter of a component whose key contains keyword (case-insensitive).
+        """
+        value = None
+        for cle, val in self.get(name).items():
+            if keyword in cle.lower():
+                value = val
+        return value
+
+def component_type(unique_name):
+    """
+    Returns the component type of a unique name (e.g. tO2TInput_1 -> tO2TInput).
+    """
+    match = COMPONENT_TYPE_PATTERN.match(unique_name)
+    return match.group(1) if match else unique_name
+
+def displayed_context_value(var, resolver, rules=None):
+    """
+    Returns the value of a context parameter (e.g. context.MAIL_HOST) as shown in the documentation,
+    or None if it is unknown or hidden (O2T and password parameters, see rules.py).
+    """
+    if resolver is None or (rules or get_rules()).hidden_context_values(var):
+        return None
+    return resolver.get(var.replace('context.', ''))
+
+def find_history_links(soup, rules=None):
+    """
+    Finds the history/follow-up CSV files referenced by links (legacy method).
+    Args:
+        soup (BeautifulSoup): Parsed HTML soup object (or one fragment of the document).
+        rules (RuleSet, optional): Filtering rules (see rules.py), the process-wide ones if not given.
+    Returns:
+        list: (file name, absolute path) tuples, in document order.
+    """
+    is_history = (rules or get_rules()).history_keywords
+    csv_files = []
+    for link in soup.find_all(['a', 'span']):
+        href = link.get('href') or link.get('data-filepath') or ''
+        if href and href.lower().endswith('.csv'):
+            if is_history(href) or is_history(link.get_text(strip=True)):
+                root_path = os.path.abspath(href)
+                csv_files.append((os.path.basename(href), root_path))
+    return csv_files
 
-def write_section(f, section, unique_components, composants_info, context_vars=None, soup=None):
+def find_history_csv_files(links, resolver, components, rules=None):
+    """
+    Lists the history CSV files of a document: the linked ones, then the files of its
+    tFileOutputDelimited/tFileInputDelimited components, with context variables substituted.
+    Args:
+        links (list): (file name, path) tuples found by find_history_links.
+        resolver (ContextResolver): Context values of the document.
+        components (ComponentIndex): Component parameter tables of the document.
+        rules (RuleSet, optional): Filtering rules (see rules.py), the process-wide ones if not given.
+    Returns:
+        list: Unique (file name, path) tuples, in discovery order.
+    """
+    is_history = (rules or get_rules()).history_keywords
+    csv_files = list(links)
+    # Components in document order (the insertion order of the index)
+    for nom_unique in components.params_by_name:
+        if component_type(nom_unique) not in ('tFileOutputDelimited', 'tFileInputDelimited'):
+            continue
+        nom_fichier = components.find_param(nom_unique, 'nom de fichier')
+        if nom_fichier and '.csv' in nom_fichier.lower() and is_history(nom_fichier):
+            chemin_reel = resolver.substitute(nom_fichier)
+            csv_files.append((os.path.basename(chemin_reel), chemin_reel))
+    # Remove duplicates (name, path)
+    seen = set()
+    unique_csv_files = []
+    for nom, chemin in csv_files:
+        key = (nom, chemin)
+        if key not in seen:
+            seen.add(key)
+            unique_csv_files.append((nom, chemin))
+    return unique_csv_files
+
+def section_model(section, parser=None):
+    """
+    Converts a section extracted from the soup (see extract_sections) to its Section model,
+    with the text of each content node, so that it no longer references the soup.
+    """
+    return Section(section['title'], [str(html_to_markdown(content, parser)) for content in section['content']])
+
+def write_section(f, section, unique_components, composants_info, context_vars=None, soup=None, resolver=None, components=None, parser=None, history_files=None, history=None,
+                  rules=None):
     """
     Writes a markdown section to the output file, handling special cases for component sections.
 
@@ -268,87 +624,78 @@ def write_section(f, section, unique_components, composants_info, context_vars=N
         f (file object): The open file object to write to.
         section (dict): Section data with 'title' and 'content'.
         unique_components (list): List of unique component types found in the documentation.
-        composants_info (dict): Dictionary of component descriptions from YAML.
+        composants_info (dict or ComponentCatalog): Component descriptions from YAML.
         context_vars (list or None): List of unique context variable names (only used for 'Liste des composants').
         soup (BeautifulSoup, optional): Parsed HTML soup object.
+        resolver (ContextResolver, optional): Context values of the document, built from soup if not given.
+        components (ComponentIndex, optional): Component parameter tables of the document, built from soup if not given.
+        parser (str, optional): Parser backend used to convert the section content (see parse_html).
+        history_files (list, optional): History CSV files (see find_history_csv_files), found from soup if not given.
+        history (dict, optional): Arguments of stat_history_files ('rows', 'run') to read the state of the history files,
+            None to list them only.
+        rules (RuleSet, optional): Filtering rules (see rules.py), the process-wide ones if not given.
+
+    Behavior:
+        Builds the section model and the facts it needs, then renders it with write_document_section.
+    """
+    doc = JobDocument(component_types=unique_components)
+    if section['title'].strip().lower() == 'liste des composants':
+        if resolver is None and soup is not None:
+            resolver = ContextResolver.from_soup(soup)
+        rules = rules or get_rules()
+        doc.context = [ContextParam(var, displayed_context_value(var, resolver, rules)) for var in context_vars or []]
+        # Search for historical CSV files
+        if history_files is None and soup is not None:
+            if components is None:
+                components = ComponentIndex.from_soup(soup)
+            history_files = find_history_csv_files(find_history_links(soup, rules), resolver, components, rules)
+        doc.history_files = substituted_history_files(history_files or [], resolver)
+        if history is not None:
+            doc.history_stats = stat_history_files([chemin for _, chemin in doc.history_files], **history)
+    write_document_section(f, section_model(section, parser), doc, composants_info)
+
+def write_document_section(f, section, doc, composants_info):
+    """
+    Writes a markdown section of a job document to the output file, handling special cases for component sections.
+
+    Args:
+        f (file object): The open file object to write to.
+        section (Section): Section to write.
+        doc (JobDocument): Document of the section (component types, context parameters and history files).
+        composants_info (dict or ComponentCatalog): Component descriptions from YAML.
 
     Behavior:
         - For component list sections, writes a table and details for each component.
-        - For other sections, converts HTML content to markdown-like text and writes it.
+        - For other sections, writes the text of each content node.
     """
-    title = section['title'].strip()
+    title = section.title.strip()
     if title.lower() == 'liste des composants':
         f.write("## Liste des composants\n\n")
         f.write("### Types de composants utilisés\n\n")
         f.write("| Type de composant |\n")
         f.write("|-------------------|\n")
-        for comp_type in unique_components:
+        for comp_type in doc.component_types:
             f.write(f"| {comp_type} |\n")
         f.write("\n---\n\n")
         # Add the 'Context Utilisé' section immediately after the component list
         f.write("## Context Utilisé\n\n")
-        if context_vars:
-            for var in context_vars:
-                var_lower = var.lower()
-                if ('o2t' in var_lower or 'password' in var_lower):
-                    f.write(f"- `{var}`\n")
+        if doc.context:
+            for param in doc.context:
+                if param.value:
+                    f.write(f"- `{param.name}` = `{param.value}`\n")
                 else:
-                    valeur = None
-                    if soup is not None:
-                        var_name = var.replace('context.', '')
-                        valeur = get_context_value_from_table(soup, var_name)
-                    if valeur:
-                        f.write(f"- `{var}` = `{valeur}`\n")
-                    else:
-                        f.write(f"- `{var}`\n")
+                    f.write(f"- `{param.name}`\n")
         else:
             f.write("_No context parameters used._\n")
-        # Search for historical CSV files
-        if soup is not None:
-            csv_files = []
-            # Search in links (legacy method)
-            for link in soup.find_all(['a', 'span']):
-                href = link.get('href') or link.get('data-filepath') or ''
-                text = link.get_text(strip=True).lower()
-                if href and href.lower().endswith('.csv'):
-                    if any(x in href.lower() or x in text for x in ['histo', 'historique', 'suivi']):
-                        root_path = os.path.abspath(href)
-                        csv_files.append((os.path.basename(href), root_path))
-            # Search in tFileOutputDelimited/tFileInputDelimited component tables
-            for table in soup.find_all('table'):
-                nom_unique = None
-                nom_fichier = None
-                for row in table.find_all('tr'):
-                    cols = row.find_all(['td', 'th'])
-                    if len(cols) >= 2:
-                        cle = cols[0].get_text(strip=True).lower()
-                        val = cols[1].get_text(strip=True)
-                        if 'nom unique' in cle:
-                            nom_unique = val
-                        if 'nom de fichier' in cle:
-                            nom_fichier = val
-                if nom_unique and nom_fichier:
-                    if ('tfileoutputdelimited' in nom_unique.lower() or 'tfileinputdelimited' in nom_unique.lower()):
-                        if ('.csv' in nom_fichier.lower() and any(x in nom_fichier.lower() for x in ['histo', 'historique', 'suivi'])):
-                            chemin_reel = substitute_context_vars(nom_fichier, soup)
-                            csv_files.append((os.path.basename(chemin_reel), chemin_reel))
-            # Display the Historique section if files are found
-            if csv_files:
-                # Remove duplicates (name, path)
-                seen = set()
-                unique_csv_files = []
-                for nom, chemin in csv_files:
-                    key = (nom, chemin)
-                    if key not in seen:
-                        seen.add(key)
-                        unique_csv_files.append((nom, chemin))
-                f.write('\n## Historique\n\n')
-                for nom, chemin in unique_csv_files:
-                    chemin_affiche = chemin
-                    if 'context.' in chemin_affiche:
-                        chemin_affiche = substitute_context_vars(chemin_affiche, soup)
-                    f.write(f'- **{nom}** : `{chemin_affiche}`\n')
-                f.write('\n---\n\n')
+        # Display the Historique section if files are found
+        if doc.history_files:
+            f.write('\n## Historique\n\n')
+            for nom, chemin in doc.history_files:
+                f.write(f'- **{nom}** : `{chemin}`\n')
+                stats = doc.history_stats.get(chemin)
+                if stats is not None:
+                    write_history_stats(f, stats)
+            f.write('\n---\n\n')
         f.write("\n---\n\n")
     elif title.lower() in ['context utilisé', 'context utilise']:
         # This section is no longer displayed here, as it is generated right after the component list
@@ -356,7 +703,7 @@ def write_section(f, section, unique_components, composants_info, context_vars=N
     elif title.lower() == 'description des composants':
         f.write("## Description des composants\n\n")
         f.write("### Utilité et exemples des composants\n\n")
-        for comp_type in unique_components:
+        for comp_type in doc.component_types:
             desc = composants_info.get(comp_type, None)
             f.write(f"#### {comp_type}\n")
             if desc:
@@ -366,163 +713,208 @@ def write_section(f, section, unique_components, composants_info, context_vars=N
                 f.write("- _Description non renseignée dans le fichier de configuration._\n\n")
         f.write("---\n\n")
     else:
-        for content in section['content']:
-            md = html_to_markdown(content)
+        for md in section.blocks:
             if md.strip():
                 f.write(md + '\n\n')
 
+def write_history_stats(f, stats):
+    """
+    Writes the size, modification time and last rows of a history file under its entry of the Historique section.
+    """
+    if stats.error:
+        f.write(f'  - _Fichier inaccessible : {stats.error}_\n')
+        return
+    f.write(f'  - {format_size(stats.size)}, modifié le {format_mtime(stats.mtime)}\n')
+    if stats.tail:
+        f.write('  - Dernières lignes :\n\n    ```\n')
+        for row in stats.tail:
+            f.write(f'    {row}\n')
+        f.write('    ```\n\n')
+
+def substituted_history_files(history_files, resolver):
+    """
+    Returns the history CSV files with the context variables of their path substituted, as shown in the documentation.
+    """
+    return [(nom, resolver.substitute(chemin) if 'context.' in chemin else chemin) for nom, chemin in history_files]
+
+class ContextUsages:
+    """
+    Every context.X usage of a document, with the components (unique names) or sections it appears in.
+    Built with a single walk over the document.
+    """
+
+    def __init__(self, used_by=None):
+        """
+        Args:
+            used_by (dict): Mapping of context parameter name (e.g. context.FOO_BAR) to the set of
+                component unique names or section titles using it.
+        """
+        self.used_by = used_by or {}
+        # Title of the last h2 seen, carried over between fragments of a document parsed piece by piece
+        self._section = ''
+
+    @classmethod
+    def from_soup(cls, soup, components=None):
+        """
+        Scans every text node of the soup once, attributing each usage to the component parameter table
+        containing it, or else to the enclosing section (the previous h2).
+        Args:
+            soup (BeautifulSoup): Parsed HTML soup object.
+            components (ComponentIndex, optional): Component parameter tables of the document.
+        Returns:
+            ContextUsages: Usages found in the document.
+        """
+        return cls().update(soup, components)
+
+    def update(self, soup, components=None):
+        """
+        Adds the usages of a soup, which may be one fragment of a document parsed piece by piece.
+        components must have been updated with this same soup for usages to be attributed to components.
+        Returns:
+            ContextUsages: self.
+        """
+        name_by_table = components.name_by_table if components is not None else {}
+        used_by = self.used_by
+        section = self._section
+        for node in soup.descendants:
+            if isinstance(node, Tag):
+                if node.name == 'h2':
+                    section = node.get_text(strip=True)
+                continue
+            if 'context.' not in node:
+                continue
+            matches = CONTEXT_REFERENCE_PATTERN.findall(node)
+            if not matches:
+                continue
+            location = section
+            if name_by_table:
+                for parent in node.parents:
+                    if parent.name == 'table' and id(parent) in name_by_table:
+                        location = name_by_table[id(parent)]
+                        break
+            for match in matches:
+                used_by.setdefault(f"context.{match}", set()).add(location)
+        self._section = section
+        return self
+
+    def variables(self):
+        """
+        Returns the sorted list of context parameter names used in the document.
+        """
+        return sorted(self.used_by)
+
+    def locations(self, var):
+        """
+        Returns the sorted component unique names or section titles using a context parameter.
+        """
+        return sorted(self.used_by.get(var, ()))
+
 def extract_context_usages(soup):
     """
     Extracts all unique context.x usages from the HTML soup.
     Args:
         soup (BeautifulSoup): Parsed HTML soup object.
     Returns:
-        set: Set of unique context parameter names (e.g., context.FOO_BAR)
+        list: Sorted list of unique context parameter names (e.g., context.FOO_BAR)
     """
-    context_pattern = re.compile(r"context\.([a-zA-Z0-9_]+)")
-    context_vars = set()
-    # Search all text nodes and code/pre blocks
-    for tag in soup.find_all(text=True):
-        for match in context_pattern.findall(tag):
-            context_vars.add(f"context.{match}")
-    return sorted(context_vars)
+    return ContextUsages.from_soup(soup).variables()
+
+O2T_NAME_PATTERN = re.compile(r"tO2T(?:Input|Output)_\d+")
+
+def find_o2t_names(soup):
+    """
+    Returns the set of tO2TInput/tO2TOutput unique names mentioned in the text of a soup.
+    """
+    noms_uniques = set()
+    for text in soup.find_all(string=O2T_NAME_PATTERN):
+        noms_uniques.update(O2T_NAME_PATTERN.findall(text))
+    return noms_uniques
 
-def write_context_section(f, context_vars, soup=None):
+def write_o2t_header(f, unique_components, composants_info, soup, components=None, o2t_names=None):
     """
-    Writes the 'Context Utilisé' section to the markdown file.
-    Affiche la valeur de chaque variable contextuelle trouvée dans le HTML.
+    Writes the One2Team header table (model / query of each tO2TInput, type list of each tO2TOutput).
 
     Args:
         f (file object): The open file object to write to.
-        context_vars (list): List of context variable names (e.g., context.MAIL_HOST).
-        soup (BeautifulSoup, optional): Parsed HTML soup object to extract values from.
-    """
-    f.write("## Context Utilisé\n\n")
-    if context_vars:
-        for var in context_vars:
-            val = None
-            if soup is not None:
-                val = get_context_value_from_table(soup, var.split('.')[-1])
-            if val:
-                f.write(f"- {var} : {val}\n")
-                val = tag.split(':')[-1].strip()
-            else:
-                val = tag.strip()
-            break
-            context_dict[var] = val
-        for var in context_vars:        
-            valeur = context_dict.get(var, None)
-            if 'mail' in var.lower():
-                if valeur:
-                    f.write(f"- `{var}` = `{valeur}`\n")
-                else:
-                    f.write(f"- `{var}`\n")
-            else:
-                f.write(f"- `{var}`\n")
-    else:
-        f.write("_Aucun paramètre contextuel utilisé._\n")
-    f.write("\n---\n\n")
+        unique_components (list): List of unique component types found in the documentation.
+        composants_info (dict or ComponentCatalog): Component descriptions from YAML.
+        soup (BeautifulSoup): Parsed HTML soup object of the document being converted.
+        components (ComponentIndex, optional): Component parameter tables of the document, built from soup if not given.
+        o2t_names (set, optional): O2T unique names of the document (see find_o2t_names), found from soup if not given.
+    """
+    # Search for all unique O2T names
+    noms_uniques = o2t_names if o2t_names is not None else find_o2t_names(soup)
+    if components is None:
+        components = ComponentIndex.from_soup(soup)
+    write_o2t_rows(f, o2t_rows(noms_uniques, components))
 
-    # Search for the correct HTML file in documentations/
-    html_path = None
-    doc_dir = os.path.join(os.path.dirname(__file__), "documentations")
-    for fname in os.listdir(doc_dir):
-        if fname.endswith(".html"):
-            html_path = os.path.join(doc_dir, fname)
-            break
-    noms_uniques = set()
-    param_data = {}
-    if html_path:
-        with open(html_path, "r", encoding="utf-8") as fin:
-            contenu = fin.read()
-            soup = BeautifulSoup(contenu, "html.parser")
-            # Search for all unique O2T names
-            for match in re.findall(r"tO2T(?:Input|Output)_\d+", contenu):
-                noms_uniques.add(match)
-            # For each unique name, find the component parameter table
-            for nom in noms_uniques:
-                table = None
-                # Search for a table containing the row "Nom unique" with the value nom
-                for t in soup.find_all("table"):
-                    found = False
-                    for row in t.find_all("tr"):
-                        cols = row.find_all(["td", "th"])
-                        if len(cols) >= 2 and "Nom unique" in cols[0].get_text(strip=True) and nom == cols[1].get_text(strip=True):
-                            table = t
-                            found = True
-                            break
-                    if found:
-                        break
-                # If the table is found, extract the useful values
-                if table:
-                    params = {}
-                    for row in table.find_all("tr"):
-                        cols = row.find_all(["td", "th"])
-                        if len(cols) >= 2:
-                            cle = cols[0].get_text(strip=True)
-                            val = cols[1].get_text(strip=True)
-                            params[cle] = val
-                    param_data[nom] = params
-def write_o2t_header(f, unique_components, composants_info):
-    import re, os
-    from bs4 import BeautifulSoup
-    # Search for the correct HTML file in documentations/
-    html_path = None
-    doc_dir = os.path.join(os.path.dirname(__file__), "documentations")
-    for fname in os.listdir(doc_dir):
-        if fname.endswith(".html"):
-            html_path = os.path.join(doc_dir, fname)
-            break
-    noms_uniques = set()
-    param_data = {}
-    if html_path:
-        with open(html_path, "r", encoding="utf-8") as fin:
-            contenu = fin.read()
-            soup = BeautifulSoup(contenu, "html.parser")
-            # Search for all unique O2T names
-            for match in re.findall(r"tO2T(?:Input|Output)_\d+", contenu):
-                noms_uniques.add(match)
-            # For each unique name, find the component parameter table
-            for nom in noms_uniques:
-                table = None
-                # Search for a table containing the row "Nom unique" with the value nom
-                for t in soup.find_all("table"):
-                    found = False
-                    for row in t.find_all("tr"):
-                        cols = row.find_all(["td", "th"])
-                        if len(cols) >= 2 and "Nom unique" in cols[0].get_text(strip=True) and nom == cols[1].get_text(strip=True):
-                            table = t
-                            found = True
-                            break
-                    if found:
-                        break
-                # If the table is found, extract the useful values
-                if table:
-                    params = {}
-                    for row in table.find_all("tr"):
-                        cols = row.find_all(["td", "th"])
-                        if len(cols) >= 2:
-                            cle = cols[0].get_text(strip=True)
-                            val = cols[1].get_text(strip=True)
-                            params[cle] = val
-                    param_data[nom] = params
-    if not noms_uniques:
+def write_o2t_rows(f, rows):
+    """
+    Writes the One2Team header table from its rows (see o2t_rows), or a notice when the job has no O2T component.
+    """
+    if not rows:
         f.write("_Aucun composant O2T trouvé dans la documentation._\n\n---\n\n")
         print("Aucun composant O2T trouvé dans la documentation.")
         return
     f.write("## En-tête One2Team\n\n")
     f.write("| Nom unique | Modèle de fiche | Requête O2T / Type List |\n")
     f.write("|------------|-----------------|-------------------------|\n")
-    for nom in sorted(noms_uniques):
-        params = param_data.get(nom, {})
+    for nom, modele, requete in rows:
+        f.write(f"| {nom} | {modele} | {requete} |\n")
+    f.write("\n---\n\n")
+
+def o2t_rows(o2t_names, components):
+    """
+    Returns the rows of the One2Team header, sorted by unique name:
+    (name, form model, O2T query) for a tO2TInput, (name, type list, '') for a tO2TOutput.
+    """
+    rows = []
+    for nom in sorted(o2t_names):
+        params = components.get(nom)
         if nom.startswith("tO2TInput"):
-            fiche_modele = params.get("modèle de fiche", "")
-            requete = params.get("Requête O2T", "")
-            f.write(f"| {nom} | {fiche_modele} | {requete} |\n")
+            rows.append((nom, params.get("modèle de fiche", ""), params.get("Requête O2T", "")))
         elif nom.startswith("tO2TOutput"):
-            type_list = params.get("Type List", "")
-            f.write(f"| {nom} | {type_list} |  |\n")
-    f.write("\n---\n\n")
+            rows.append((nom, params.get("Type List", ""), ""))
+    return rows
+
+def build_job_document(source, connector_info, unique_components, components, o2t_names, context_usages, resolver,
+                       history_files, sections=(), rules=None):
+    """
+    Builds the model of a job documentation from the facts extracted from its HTML.
+    Args:
+        source (str): Name of the HTML file.
+        connector_info (dict): Connector metadata (see parse_connector_info).
+        unique_components (list): Unique component types of the job.
+        components (ComponentIndex): Component parameter tables of the job.
+        o2t_names (set): O2T unique names of the job.
+        context_usages (ContextUsages): Context parameters used by the job.
+        resolver (ContextResolver): Context values of the job.
+        history_files (list): History CSV files (see find_history_csv_files).
+        sections (iterable): Section models (see section_model) of the rendered sections.
+        rules (RuleSet, optional): Filtering rules (see rules.py), the process-wide ones if not given.
+    Returns:
+        JobDocument: Model of the job, without reference to the soup.
+    """
+    rules = rules or get_rules()
+    return JobDocument(
+        source=source,
+        connector=dict(connector_info),
+        sections=list(sections),
+        component_types=list(unique_components),
+        components={name: component_type(name) for name in components.params_by_name},
+        o2t=o2t_rows(o2t_names, components),
+        context=[ContextParam(var, displayed_context_value(var, resolver, rules), context_usages.locations(var))
+                 for var in context_usages.variables()],
+        history_files=substituted_history_files(history_files, resolver),
+    )
+
+def write_title(f):
+    """
+    Writes the title block at the top of the markdown file.
+    """
+    f.write("# Talend Documentation\n\n")
+    f.write("> Generated automatically.\n\n")
+    f.write("---\n\n")
 
 def write_simple_summary(f, sections):
     """
@@ -539,37 +931,213 @@ def write_simple_summary(f, sections):
         f.write(f"- {titre}\n")
     f.write("\n")
 
-def generate_markdown(input_path, output_path):
+def iter_markdown(doc, composants_info):
+    """
+    Renders the markdown documentation of a job document piece by piece.
+    Args:
+        doc (JobDocument): Model of the job.
+        composants_info (dict or ComponentCatalog): Component descriptions from YAML.
+    Yields:
+        str: The header (title, summary, connector description, O2T header), then each section, then the footer.
+    """
+    f = io.StringIO()
+    write_title(f)
+    # Add simple summary without links
+    write_simple_summary(f, doc.sections)
+    # Connector description
+    write_connector_description(f, doc.connector)
+    # Add O2T header juste après la description du connecteur
+    with instrumentation.span('o2t_header'):
+        write_o2t_rows(f, doc.o2t)
+    yield f.getvalue()
+    # Write all other sections, except En-tête One2Team
+    rules = get_rules()
+    for section in doc.sections:
+        if not is_rendered_section(section.title, rules):
+            continue
+        f = io.StringIO()
+        with instrumentation.span('write_section', title=section.title):
+            write_document_section(f, section, doc, composants_info)
+        yield f.getvalue()
+    yield "\n---\n"
+
+def render_markdown(f, doc, composants_info):
+    """
+    Writes the markdown documentation of a job document.
+    Args:
+        f (file object): The open file object to write to.
+        doc (JobDocument): Model of the job.
+        composants_info (dict or ComponentCatalog): Component descriptions from YAML.
+    """
+    for chunk in iter_markdown(doc, composants_info):
+        f.write(chunk)
+
+# Output formats: renderer of a job document and extension of the output file
+RENDERERS = {'md': render_markdown, 'json': render_json, 'html': render_html}
+OUTPUT_EXTENSIONS = {'md': '.md', 'json': '.json', 'html': '.html'}
+
+def iter_render(doc, fmt='md'):
+    """
+    Renders a job document in memory.
+    Args:
+        doc (JobDocument): Model of the job.
+        fmt (str): Output format ('md', 'json' or 'html', see RENDERERS).
+    Yields:
+        str: Chunks of the output; the markdown comes section by section, the other formats in one piece.
+    """
+    composants_info = get_component_catalog()
+    if fmt == 'md':
+        yield from iter_markdown(doc, composants_info)
+        return
+    f = io.StringIO()
+    RENDERERS[fmt](f, doc, composants_info)
+    yield f.getvalue()
+
+@contextlib.contextmanager
+def open_atomic(path):
+    """
+    Opens a temporary text file next to path, renamed to path only once the block succeeds,
+    so that readers never see a half-written file.
+    """
+    tmp_path = path + '.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def render_job_document(doc, outputs):
+    """
+    Writes the output files of a job document, e.g. one loaded from the model cache (see JobDocument.load).
+    Each file is written atomically (see open_atomic).
+    Args:
+        doc (JobDocument): Model of the job.
+        outputs (dict): Output format ('md', 'json' or 'html', see RENDERERS) -> path of the output file.
+    """
+    # Checked once for every format of the document: the lookups of the renderers then read the loaded descriptions
+    get_component_catalog().refresh()
+    for fmt, output_path in outputs.items():
+        with instrumentation.span('render', format=fmt):
+            with open_atomic(output_path) as f:
+                for chunk in iter_render(doc, fmt):
+                    f.write(chunk)
+        print(f"Clean documentation generated in {output_path}")
+
+def read_html(source):
+    """
+    Returns the HTML text of a source, with the same decoding and newline handling whatever its kind.
+    Args:
+        source (str, bytes or file object): Path to an HTML file, HTML content as UTF-8 bytes,
+            or file-like object opened in text or binary mode.
+    Returns:
+        str: The HTML content.
+    """
+    if isinstance(source, str):
+        with open(source, 'r', encoding='utf-8') as f:
+            return f.read()
+    data = source if isinstance(source, (bytes, bytearray)) else source.read()
+    if isinstance(data, str):
+        return data
+    return io.TextIOWrapper(io.BytesIO(data), encoding='utf-8').read()
+
+def extract_job_document(source, parser=None, name=None):
+    """
+    Parses a Talend HTML documentation once and extracts the model of the job.
+    Args:
+        source (str, bytes or file object): HTML documentation (see read_html).
+        parser (str, optional): Parser backend, 'lxml' or 'html.parser' (DEFAULT_PARSER if not given).
+        name (str, optional): Name of the HTML file recorded in the model (file name of source if it is a path).
+    Returns:
+        JobDocument: Model of the job, holding only the sections to render.
+    """
+    if name is None:
+        name = os.path.basename(source) if isinstance(source, str) else ''
+    with instrumentation.span('parse') as parse_span:
+        html = read_html(source)
+        soup = parse_html(html, parser)
+        parse_span.set(size_bytes=len(html))
+    # Resolved once per document: the matchers are then called per node without checking the rules file again
+    rules = get_rules()
+    with instrumentation.span('extract_sections'):
+        sections = extract_sections(soup, rules)
+        unique_components = extract_unique_components(soup)
+        connector_info = parse_connector_info(sections, parser)
+    with instrumentation.span('component_index'):
+        components = ComponentIndex.from_soup(soup)
+    with instrumentation.span('extract_context'):
+        context_usages = ContextUsages.from_soup(soup, components)
+        resolver = ContextResolver.from_soup(soup)
+        o2t_names = find_o2t_names(soup)
+        history_files = find_history_csv_files(find_history_links(soup, rules), resolver, components, rules)
+    with instrumentation.span('build_model'):
+        rendered = [section_model(s, parser) for s in sections if is_rendered_section(s['title'], rules)]
+        return build_job_document(name, connector_info, unique_components, components,
+                                  o2t_names, context_usages, resolver, history_files, rendered, rules)
+
+def convert_html(source, fmt='md', parser=None):
+    """
+    Converts a Talend HTML documentation in memory, without any file, e.g. for an upload received over HTTP.
+    Args:
+        source (str, bytes or file object): HTML documentation (see read_html).
+        fmt (str): Output format ('md', 'json' or 'html', see RENDERERS).
+        parser (str, optional): Parser backend, 'lxml' or 'html.parser' (DEFAULT_PARSER if not given).
+    Returns:
+        str: The whole output document.
+    """
+    return ''.join(iter_convert_html(source, fmt, parser))
+
+def iter_convert_html(source, fmt='md', parser=None):
+    """
+    Converts a Talend HTML documentation in memory and yields the output chunk by chunk (see iter_render),
+    e.g. to stream the markdown in an HTTP response. The HTML is parsed before the first chunk is yielded.
+    """
+    doc = extract_job_document(source, parser)
+    get_component_catalog().refresh()
+    yield from iter_render(doc, fmt)
+
+def generate_documents(input_path, outputs, parser=None, model_path=None, history=None):
+    """
+    Generates several output formats of a Talend HTML file from a single parse.
+
+    Args:
+        input_path (str): Path to the input HTML file.
+        outputs (dict): Output format ('md', 'json' or 'html', see RENDERERS) -> path of the output file.
+        parser (str, optional): Parser backend, 'lxml' or 'html.parser' (DEFAULT_PARSER if not given).
+        model_path (str, optional): Path where the model of the job (JobDocument) is saved, to render it again later
+            without parsing the HTML.
+        history (dict, optional): Arguments of stat_history_files ('rows', 'run') to read the size, modification time
+            and last rows of the history files, None to list them only.
+
+    Returns:
+        dict: Facts extracted from the job (see JobDocument.facts).
+    """
+    with instrumentation.span('generate_markdown', document=os.path.basename(input_path)) as doc_span:
+        doc_span.set(size_bytes=os.path.getsize(input_path))
+        doc = extract_job_document(input_path, parser)
+        if history is not None and doc.history_files:
+            with instrumentation.span('history_stats', files=len(doc.history_files)):
+                doc.history_stats = stat_history_files([chemin for _, chemin in doc.history_files], **history)
+        if model_path is not None:
+            with instrumentation.span('save_model'):
+                doc.save(model_path)
+        render_job_document(doc, outputs)
+    return doc.facts()
+
+def generate_markdown(input_path, output_path, parser=None, model_path=None, history=None):
     """
     Orchestrates the generation of a markdown documentation file from a Talend HTML file.
 
     Args:
         input_path (str): Path to the input HTML file.
         output_path (str): Path to the output markdown file.
+        parser (str, optional): Parser backend, 'lxml' or 'html.parser' (DEFAULT_PARSER if not given).
+        model_path (str, optional): Path where the model of the job (JobDocument) is saved (see generate_documents).
+        history (dict, optional): Arguments of stat_history_files (see generate_documents).
+
+    Returns:
+        dict: Facts extracted from the job (see JobDocument.facts).
     """
-    with open(input_path, 'r', encoding='utf-8') as f:
-        html = f.read()
-    soup = BeautifulSoup(html, 'html.parser')
-    sections = extract_sections(soup)
-    unique_components = extract_unique_components(soup)
-    composants_info = load_composant_descriptions(os.path.join(os.path.dirname(__file__), "composants.yaml"))
-    connector_info = parse_connector_info(sections)
-    context_vars = extract_context_usages(soup)
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write("# Talend Documentation\n\n")
-        f.write("> Generated automatically.\n\n")
-        f.write("---\n\n")
-        # Add simple summary without links
-        write_simple_summary(f, sections)
-        # Connector description
-        write_connector_description(f, connector_info)
-        # Add O2T header juste après la description du connecteur
-        write_o2t_header(f, unique_components, composants_info)
-        # Write all other sections, except En-tête One2Team
-        for section in sections:
-            titre = section['title'].strip().lower()
-            if titre in ['description du connecteur', 'en-tête one2team', 'description du projet', 'description', 'résumé', 'paramètres', 'code source']:
-                continue
-            write_section(f, section, unique_components, composants_info, context_vars, soup)
-        f.write("\n---\n")
-    print(f"Clean documentation generated in {output_path}")
+    return generate_documents(input_path, {'md': output_path}, parser, model_path, history)
@@ -0,0 +1,105 @@
+import argparse
+import random
+
+# Component types drawn for the generic components of a synthetic job
+FILLER_COMPONENT_TYPES = ['tMap', 'tJava', 'tLogRow', 'tFileList', 'tFileDelete', 'tDie', 'tSendMail', 'tJavaRow', 'tRunJob']
+
+def generate_talend_html(components=50, context_vars=20, context_tables=2, sections=5, seed=0):
+    """
+    Builds a synthetic Talend job documentation HTML file, with the structure of the Talend HTML export:
+    Description table, component list, Contexte<Name> marker tables followed by Nom/Valeur tables,
+    one parameter table per component (with its "Nom unique") and free text sections.
+    Args:
+        components (int): Number of components; includes tO2TInput/tO2TOutput and tFile*Delimited components.
+        context_vars (int): Number of context variables defined in each context table.
+        context_tables (int): Number of contexts (ContextePROD, ContexteDefault, then ContexteENV<n>).
+        sections (int): Number of additional free text sections.
+        seed (int): Seed of the random generator, for reproducible documents.
+    Returns:
+        str: The HTML document.
+    """
+    rng = random.Random(seed)
+    context_names = ['PROD', 'Default'] + [f'ENV{i}' for i in range(2, max(context_tables, 2))]
+    context_names = context_names[:max(context_tables, 1)]
+    variables = [f'VAR_{i}' for i in range(context_vars)] or ['VAR_0']
+
+    # Unique names: a few O2T and history CSV components, then generic ones
+    special = ['tO2TInput', 'tO2TOutput', 'tFileOutputDelimited', 'tFileInputDelimited']
+    counters = {}
+    unique_names = []
+    for i in range(components):
+        comp_type = special[i % len(special)] if i < components // 5 + len(special) else rng.choice(FILLER_COMPONENT_TYPES)
+        counters[comp_type] = counters.get(comp_type, 0) + 1
+        unique_names.append((f'{comp_type}_{counters[comp_type]}', comp_type))
+
+    p = ['<!DOCTYPE html>', '<html>', '<head><meta charset="utf-8"><title>Synthetic job</title></head>', '<body>']
+    p.append('<h1>Job SyntheticJob</h1>')
+    p.append('<h2>Description</h2>')
+    p.append('<table class="description">')
+    p.append('<tr><td>Nom</td><td>SyntheticJob</td></tr>')
+    p.append('<tr><td>Version</td><td>0.1</td></tr>')
+    p.append('<tr><td>Objectif</td><td>Synthetic job generated for benchmarks.</td></tr>')
+    p.append('<tr><td>Création</td><td>01/01/2025</td></tr>')
+    p.append('<tr><td>Modification</td><td>02/01/2025</td></tr>')
+    p.append('<tr><td>Historique</td><td>v1.0 07/05/2025 AFE - Création<br>v1.1 08/05/2025 AFE - Évolution</td></tr>')
+    p.append('</table>')
+
+    p.append('<h2>Liste des composants</h2>')
+    p.append('<table class="components"><tr><th>Nom du composant</th><th>Type du composant</th></tr>')
+    for name, comp_type in unique_names:
+        p.append(f'<tr><td>{name}</td><td>{comp_type}</td></tr>')
+    p.append('</table>')
+    p.append('<h2>Description des composants</h2><p>Voir les paramètres des composants.</p>')
+
+    p.append('<h2>Liste des contextes</h2>')
+    for context in context_names:
+        p.append(f'<table class="context"><tr><td>Contexte{context}</td></tr></table>')
+        p.append('<table class="context"><tr><th>Nom</th><th>Type</th><th>Valeur</th></tr>')
+        for var in variables:
+            p.append(f'<tr><td>{var}</td><td>String</td><td>/data/{context.lower()}/{var.lower()}</td></tr>')
+        p.append('</table>')
+
+    for name, comp_type in unique_names:
+        var = rng.choice(variables)
+        p.append(f'<h2>Paramètres du composant {name}</h2>')
+        p.append('<table class="parameters">')
+        p.append(f'<tr><th>Propriété</th><th>Valeur</th></tr><tr><td>Nom unique</td><td>{name}</td></tr>')
+        if comp_type == 'tO2TInput':
+            p.append('<tr><td>modèle de fiche</td><td>Projet</td></tr>')
+            p.append(f'<tr><td>Requête O2T</td><td>SELECT * FROM projets WHERE code = context.{var}</td></tr>')
+        elif comp_type == 'tO2TOutput':
+            p.append('<tr><td>Type List</td><td>Tâches</td></tr>')
+        elif comp_type in ('tFileOutputDelimited', 'tFileInputDelimited'):
+            kind = rng.choice(['histo', 'suivi', 'export'])
+            p.append(f'<tr><td>Nom de fichier</td><td>context.{var} + "/{kind}_{name}.csv"</td></tr>')
+            p.append('<tr><td>Séparateur de champs</td><td>";"</td></tr>')
+        else:
+            p.append(f'<tr><td>Code</td><td>System.out.println(context.{var});</td></tr>')
+        p.append('</table>')
+
+    for i in range(sections):
+        p.append(f'<h2>Notes {i + 1}</h2>')
+        p.append(f'<p>Section libre {i + 1}, utilise context.{rng.choice(variables)}.</p>')
+        p.append('<div class="contextual">Bloc de contexte ignoré</div>')
+
+    p.append('<h2>Code source</h2><pre>// code généré</pre>')
+    p.append('</body>')
+    p.append('</html>')
+    return '\n'.join(p)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Génère un fichier HTML de documentation Talend synthétique.")
+    parser.add_argument('output', help="Fichier HTML à écrire")
+    parser.add_argument('--components', type=int, default=50, help="Nombre de composants (défaut : 50)")
+    parser.add_argument('--context-vars', type=int, default=20, help="Nombre de variables de contexte (défaut : 20)")
+    parser.add_argument('--context-tables', type=int, default=2, help="Nombre de contextes (défaut : 2)")
+    parser.add_argument('--sections', type=int, default=5, help="Nombre de sections libres (défaut : 5)")
+    parser.add_argument('--seed', type=int, default=0, help="Graine aléatoire (défaut : 0)")
+    args = parser.parse_args(argv)
+    html = generate_talend_html(args.components, args.context_vars, args.context_tables, args.sections, args.seed)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        f.write(html)
+    print(f"Documentation synthétique écrite dans {args.output}")
+
+if __name__ == "__main__":
+    main()
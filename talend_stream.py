@@ -0,0 +1,165 @@
+import os
+import re
+import shutil
+import tempfile
+import instrumentation
+from job_document import Section
+from rules import get_rules
+from talend_doc_cleaner import (
+    ComponentIndex, ContextResolver, ContextUsages, build_job_document, component_types_from_table,
+    extract_sections, find_history_csv_files, find_history_links, find_o2t_names, get_component_catalog,
+    is_rendered_section, open_atomic, parse_connector_info, parse_html, section_model, write_connector_description,
+    write_o2t_header, write_section, write_simple_summary, write_title,
+)
+
+# Start of an h2 heading: the document is only cut just before one of them
+H2_START_PATTERN = re.compile(r'<h2[\s>/]', re.IGNORECASE)
+BLOCK_SIZE = 256 * 1024
+# Rendered sections are kept in memory up to this many characters, then spooled to a temporary file
+SPOOL_MAX_SIZE = 4 * 1024 * 1024
+# Sections rendered from document-wide facts, only known once the whole document has been read
+DEFERRED_SECTIONS = ('liste des composants', 'description des composants')
+
+def iter_section_chunks(input_path, block_size=BLOCK_SIZE):
+    """
+    Reads an HTML file block by block and yields it cut just before <h2> tags, in pieces of whole sections:
+    each piece ends just before the last heading found in the text read so far, so it holds about block_size
+    characters, or a single section larger than that. Only the current piece is held in memory.
+    Args:
+        input_path (str): Path to the HTML file.
+        block_size (int): Number of characters read at a time.
+    Yields:
+        str: HTML pieces, in document order; the first one starts with the text before the first heading.
+    """
+    with open(input_path, 'r', encoding='utf-8') as f:
+        buffer = ''
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            # Only the new text is searched; a heading may start in the last few characters of the previous block
+            search_from = max(1, len(buffer) - 4)
+            buffer += block
+            cut = None
+            for match in H2_START_PATTERN.finditer(buffer, search_from):
+                cut = match.start()
+            if cut is not None:
+                yield buffer[:cut]
+                buffer = buffer[cut:]
+        if buffer:
+            yield buffer
+
+def new_spool():
+    """
+    Returns a temporary text file holding rendered markdown, in memory until it exceeds SPOOL_MAX_SIZE.
+    """
+    return tempfile.SpooledTemporaryFile(SPOOL_MAX_SIZE, mode='w+', encoding='utf-8', newline='')
+
+def generate_markdown_streaming(input_path, output_path, parser=None, block_size=BLOCK_SIZE, history=None):
+    """
+    Generates the same markdown file as generate_markdown with bounded memory, for very large job exports.
+    The document is read once, in pieces of whole sections (see iter_section_chunks), each piece being parsed once
+    and discarded once processed: its document-wide facts (component tables, contexts, context usages, O2T names,
+    history files, connector description) are collected and its sections rendered to temporary files, except
+    the component list and descriptions, which need the facts of the whole document and are rendered at the end,
+    when the header and the spooled sections are written out in order.
+    Peak memory depends on block_size and the largest section, plus the facts kept for the whole document
+    (the parameters of every component, growing with their number), not on the size of the document.
+    The markdown file is written atomically (see open_atomic).
+    Headings (h2) are expected at the top level of the document, as in Talend exports.
+
+    Args:
+        input_path (str): Path to the input HTML file.
+        output_path (str): Path to the output markdown file.
+        parser (str, optional): Parser backend, 'lxml' or 'html.parser' (DEFAULT_PARSER if not given).
+        block_size (int): Number of characters read at a time.
+        history (dict, optional): Arguments of stat_history_files ('rows', 'run') to read the state of the history files,
+            None to list them only.
+
+    Returns:
+        dict: Facts extracted from the job (see JobDocument.facts).
+    """
+    with instrumentation.span('generate_markdown', document=os.path.basename(input_path), streaming=True) as doc_span:
+        doc_span.set(size_bytes=os.path.getsize(input_path))
+        composants_info = get_component_catalog().refresh()
+        # Resolved once per document: the matchers are then called per node without checking the rules file again
+        rules = get_rules()
+        components = ComponentIndex()
+        resolver = ContextResolver()
+        usages = ContextUsages()
+        o2t_names = set()
+        links = []
+        unique_components = set()
+        component_list = None  # None: not found yet, 'waiting': heading found but not its table, 'done'
+        connector_info = None
+        # Rendered sections, cut before each deferred section
+        segments = [new_spool()]
+        deferred = []
+        try:
+            with instrumentation.span('scan'):
+                for chunk in iter_section_chunks(input_path, block_size):
+                    soup = parse_html(chunk, parser)
+                    components.update(soup)
+                    usages.update(soup, components)
+                    resolver.update(soup)
+                    o2t_names.update(find_o2t_names(soup))
+                    links.extend(find_history_links(soup, rules))
+                    if component_list is None:
+                        h2 = next((h for h in soup.find_all('h2') if 'composant' in h.get_text(strip=True).lower()), None)
+                        if h2 is not None:
+                            table = h2.find_next('table')
+                            component_list = 'waiting' if table is None else 'done'
+                            if table is not None:
+                                unique_components.update(component_types_from_table(table))
+                    elif component_list == 'waiting':
+                        table = soup.find('table')
+                        if table is not None:
+                            unique_components.update(component_types_from_table(table))
+                            component_list = 'done'
+                    sections = extract_sections(soup, rules)
+                    if connector_info is None:
+                        desc = [s for s in sections if s['title'].strip().lower() == 'description']
+                        if desc:
+                            connector_info = parse_connector_info(desc[:1], parser)
+                    for section in sections:
+                        if not is_rendered_section(section['title'], rules):
+                            continue
+                        if section['title'].strip().lower() in DEFERRED_SECTIONS:
+                            # Its content is not shown: only its title is kept
+                            deferred.append({'title': section['title'], 'content': []})
+                            segments.append(new_spool())
+                        else:
+                            # Other sections only depend on their own content
+                            write_section(segments[-1], section, [], composants_info, parser=parser, rules=rules)
+                    # Break the parent/child reference cycles so the piece is freed right away
+                    soup.decompose()
+            unique_components = sorted(unique_components)
+            context_vars = usages.variables()
+            history_files = find_history_csv_files(links, resolver, components, rules)
+            if connector_info is None:
+                connector_info = parse_connector_info([], parser)
+            with open_atomic(output_path) as f:
+                write_title(f)
+                # Add simple summary without links
+                write_simple_summary(f, [])
+                # Connector description
+                write_connector_description(f, connector_info)
+                # Add O2T header juste après la description du connecteur
+                with instrumentation.span('o2t_header'):
+                    write_o2t_header(f, unique_components, composants_info, None, components, o2t_names)
+                # Write all other sections in order, the deferred ones between the spooled ones
+                with instrumentation.span('render'):
+                    for i, segment in enumerate(segments):
+                        segment.seek(0)
+                        shutil.copyfileobj(segment, f)
+                        if i < len(deferred):
+                            write_section(f, deferred[i], unique_components, composants_info, context_vars, None,
+                                          resolver, components, parser, history_files, history, rules)
+                f.write("\n---\n")
+        finally:
+            for segment in segments:
+                segment.close()
+    print(f"Clean documentation generated in {output_path}")
+    doc = build_job_document(os.path.basename(input_path), connector_info, unique_components, components, o2t_names,
+                             usages, resolver, history_files, rules=rules)
+    return doc.facts()
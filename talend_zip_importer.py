@@ -1,39 +1,132 @@
 import os
 import zipfile
 import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from archive_store import ArchiveStore
 
 # Directories can be changed if needed
 ZIPS_DIR = 'zips'  # Folder where you put ZIP files to process
 DOCUMENTATIONS_DIR = 'documentations'  # Where to place .html_0.1.item files
 ARCHIVES_DIR = 'archives'  # Where to archive processed ZIP files
 
-os.makedirs(DOCUMENTATIONS_DIR, exist_ok=True)
-os.makedirs(ARCHIVES_DIR, exist_ok=True)
+def html_file_names(members):
+    """
+    Returns the file name under which each HTML member of an archive is written: its own name, or, when several members
+    have the same name (e.g. JobA_0.1/documentation.html and JobB_0.1/documentation.html), their path in the archive
+    with '_' instead of '/' (JobA_0.1_documentation.html), so that no member overwrites another.
+    Args:
+        members (list): ZipInfo of the HTML members.
+    Returns:
+        list: File names, in the order of members, all different (case-insensitively).
+    """
+    counts = {}
+    for member in members:
+        name = os.path.basename(member.filename).lower()
+        counts[name] = counts.get(name, 0) + 1
+    names = []
+    taken = set()
+    for member in members:
+        name = os.path.basename(member.filename)
+        if counts[name.lower()] > 1:
+            name = '_'.join(part for part in member.filename.replace('\\', '/').split('/') if part)
+        base, ext = os.path.splitext(name)
+        unique, n = name, 1
+        while unique.lower() in taken:
+            n += 1
+            unique = f"{base}_{n}{ext}"
+        taken.add(unique.lower())
+        names.append(unique)
+    return names
 
-zip_files = [f for f in os.listdir(ZIPS_DIR) if f.lower().endswith('.zip')]
-if not zip_files:
-    print(f"Aucun fichier zip trouvé dans {ZIPS_DIR}")
-for filename in zip_files:
-    zip_path = os.path.join(ZIPS_DIR, filename)
-    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-        temp_extract_dir = os.path.join(ZIPS_DIR, '__extract_temp__')
-        zip_ref.extractall(temp_extract_dir)
-        # Cherche le premier fichier .html dans le zip
-        found = False
-        for root, dirs, files in os.walk(temp_extract_dir):
-            for file in files:
-                if file.lower().endswith('.html'):
-                    src = os.path.join(root, file)
-                    dst = os.path.join(DOCUMENTATIONS_DIR, file)
-                    shutil.copy2(src, dst)
-                    print(f"Copié {file} dans {DOCUMENTATIONS_DIR}")
-                    found = True
-                    break
-            if found:
-                break
-        if not found:
-            print(f"Aucun fichier .html trouvé dans {filename}")
-        shutil.rmtree(temp_extract_dir)
-    # Déplace le zip dans archives
-    shutil.move(zip_path, os.path.join(ARCHIVES_DIR, filename))
-    print(f"Archivé {filename} dans {ARCHIVES_DIR}")
+def import_zip(zip_path, dest=DOCUMENTATIONS_DIR, archives_dir=ARCHIVES_DIR, on_html=None):
+    """
+    Streams every .html member of a ZIP archive to dest, then files the archive in the archive store of archives_dir.
+    Members are read from the central directory, nothing else is extracted. HTML members with the same name in different
+    folders are written under distinct names (see html_file_names).
+    Args:
+        zip_path (str): Path to the ZIP file.
+        dest (str): Folder where the HTML files are written.
+        archives_dir (str): Folder of the archive store (see ArchiveStore).
+        on_html (callable, optional): Called with the path of each HTML file as soon as it is written,
+            e.g. to start its conversion before the rest of the archive is imported. May block to slow the import down.
+    Returns:
+        dict: Report with keys 'zip' (file name), 'html_files' (paths written) and 'error' (None on success).
+    """
+    filename = os.path.basename(zip_path)
+    report = {'zip': filename, 'html_files': [], 'error': None}
+    try:
+        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+            html_members = [m for m in zip_ref.infolist() if not m.is_dir() and m.filename.lower().endswith('.html')]
+            for member, file in zip(html_members, html_file_names(html_members)):
+                dst = os.path.join(dest, file)
+                # Write to a temporary file first so concurrent imports never expose a partial HTML file
+                fd, tmp_path = tempfile.mkstemp(dir=dest, suffix='.tmp')
+                with zip_ref.open(member) as src, os.fdopen(fd, 'wb') as out:
+                    shutil.copyfileobj(src, out)
+                # Keep the modification time of the archived file, as shutil.copy2 did
+                mtime = time.mktime(member.date_time + (0, 0, -1))
+                os.utime(tmp_path, (mtime, mtime))
+                os.replace(tmp_path, dst)
+                report['html_files'].append(dst)
+                print(f"Copié {file} dans {dest}")
+                if on_html is not None:
+                    on_html(dst)
+            if not html_members:
+                print(f"Aucun fichier .html trouvé dans {filename}")
+        # Range le zip dans le stockage des archives
+        entry = ArchiveStore(archives_dir).store(zip_path)
+        print(f"Archivé {filename} dans {archives_dir}" + (" (contenu déjà archivé)" if entry['duplicate'] else ''))
+    except Exception as e:
+        report['error'] = f"{type(e).__name__}: {e}"
+        print(f"Erreur lors de l'import de {filename}: {e}")
+    return report
+
+def import_zips(src=ZIPS_DIR, dest=DOCUMENTATIONS_DIR, archives_dir=ARCHIVES_DIR, workers=4, on_html=None, names=None,
+                claims=None):
+    """
+    Imports every ZIP file of src, handling several archives at once with a thread pool.
+    Args:
+        src (str): Folder containing the ZIP files to process.
+        dest (str): Folder where the HTML files are written.
+        archives_dir (str): Folder of the archive store (see ArchiveStore).
+        workers (int): Number of archives imported concurrently.
+        on_html (callable, optional): Called with the path of each HTML file as soon as it is written (see import_zip).
+        names (list, optional): Names of the ZIP files of src to import (every ZIP file of src by default).
+        claims (WorkClaims, optional): Claims of src shared with other importers (see work_claims.py): only the ZIP files
+            this importer could claim are imported, and those that fail are given back.
+    Returns:
+        list: One report per ZIP file (see import_zip), sorted by ZIP file name.
+    """
+    os.makedirs(dest, exist_ok=True)
+    os.makedirs(archives_dir, exist_ok=True)
+    if names is not None:
+        zip_files = sorted(names)
+    else:
+        zip_files = sorted(f for f in os.listdir(src) if f.lower().endswith('.zip')) if os.path.isdir(src) else []
+    if not zip_files:
+        print(f"Aucun fichier zip trouvé dans {src}")
+        return []
+    if claims is not None:
+        zip_files = [f for f in zip_files if claims.claim(f)]
+        if not zip_files:
+            print(f"Fichiers zip de {src} déjà pris en charge par d'autres processus")
+            return []
+        zip_paths = [claims.path(f) for f in zip_files]
+    else:
+        zip_paths = [os.path.join(src, f) for f in zip_files]
+    if workers <= 1:
+        reports = [import_zip(p, dest, archives_dir, on_html) for p in zip_paths]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            reports = list(executor.map(lambda p: import_zip(p, dest, archives_dir, on_html), zip_paths))
+    if claims is not None:
+        # Give back the archives that could not be imported: they stay in src, as without claims
+        for report in reports:
+            if report['error'] and os.path.exists(claims.path(report['zip'])):
+                claims.release(report['zip'])
+    return reports
+
+if __name__ == "__main__":
+    import_zips()
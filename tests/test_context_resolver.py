@@ -0,0 +1,28 @@
+from talend_doc_cleaner import ContextResolver, parse_html
+from talend_html_generator import generate_talend_html
+
+def test_stray_contexte_text_before_the_context_list_is_not_a_marker():
+    html = generate_talend_html(components=10, context_vars=3, context_tables=2)
+    # A parameter value starting with "Contexte", in a table before the context tables
+    stray = ('<table class="parameters"><tr><th>Propriété</th><th>Valeur</th></tr>'
+             '<tr><td>Nom de fichier</td><td>ContexteFichier.csv</td></tr></table>')
+    html = html.replace('<h2>Liste des composants</h2>', stray + '<h2>Liste des composants</h2>', 1)
+
+    resolver = ContextResolver.from_soup(parse_html(html))
+
+    assert resolver.get('VAR_0') == '/data/prod/var_0'
+    assert resolver.get('VAR_0', 'Default') == '/data/default/var_0'
+    assert 'Fichier' not in resolver.contexts
+
+def test_each_context_gets_its_own_values():
+    value_table = '<table><tr><th>Nom</th><th>Valeur</th></tr><tr><td>A</td><td>{}</td></tr></table>'
+    documents = {
+        'one table listing every context': '<table><tr><td>ContextePROD ContexteDefault</td></tr></table>'
+                                           + value_table.format('prod') + value_table.format('default'),
+        'layout table': '<table><tr><td><table><tr><td>ContextePROD</td></tr></table>' + value_table.format('prod')
+                        + '<table><tr><td>ContexteDefault</td></tr></table>' + value_table.format('default')
+                        + '</td></tr></table>',
+    }
+    for name, html in documents.items():
+        resolver = ContextResolver.from_soup(parse_html(html))
+        assert resolver.contexts == {'PROD': {'A': 'prod'}, 'Default': {'A': 'default'}}, name
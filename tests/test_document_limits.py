@@ -0,0 +1,34 @@
+import signal
+import time
+import pytest
+from document_limits import DocumentLimits, LimitExceeded
+from talend_doc_cleaner import load_composant_descriptions
+
+def test_a_conversion_over_its_timeout_is_interrupted():
+    handler = signal.getsignal(signal.SIGALRM)
+    start = time.monotonic()
+
+    with pytest.raises(LimitExceeded) as exc_info:
+        with DocumentLimits(timeout=0.5):
+            while time.monotonic() - start < 10:
+                pass
+
+    assert exc_info.value.reason == 'timeout'
+    assert time.monotonic() - start < 5
+    # The timer is disarmed and the previous handler restored
+    assert signal.getitimer(signal.ITIMER_REAL) == (0.0, 0.0)
+    assert signal.getsignal(signal.SIGALRM) == handler
+
+def test_limit_exceeded_is_not_swallowed_by_error_handlers(monkeypatch):
+    # load_composant_descriptions returns {} on any error: a timeout while loading must still stop the conversion
+    def slow_load(f):
+        time.sleep(10)
+
+    monkeypatch.setattr('yaml.safe_load', slow_load)
+    start = time.monotonic()
+
+    with pytest.raises(LimitExceeded):
+        with DocumentLimits(timeout=0.5):
+            load_composant_descriptions()
+
+    assert time.monotonic() - start < 5
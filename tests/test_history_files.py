@@ -0,0 +1,54 @@
+import os
+from build_manifest import BuildManifest
+from history_files import TAIL_BLOCK_SIZE, history_signatures, stat_history_files, tail_rows
+
+def test_document_is_stale_once_a_history_file_appears_or_changes(tmp_path):
+    csv_path = str(tmp_path / 'histo.csv')
+    output_path = str(tmp_path / 'doc.md')
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write('doc')
+    manifest = BuildManifest(str(tmp_path / 'manifest.json'), catalog_path='', rules_path='')
+    signatures = lambda paths: history_signatures(paths)
+
+    manifest.record('key', output_path, history_signatures([csv_path]))
+    assert manifest.is_up_to_date('key', output_path, signatures)
+    with open(csv_path, 'w', encoding='utf-8') as f:
+        f.write('a;b\n')
+    assert not manifest.is_up_to_date('key', output_path, signatures)
+
+    manifest.record('key', output_path, history_signatures([csv_path]))
+    manifest.save()
+    manifest = BuildManifest(str(tmp_path / 'manifest.json'), catalog_path='', rules_path='')
+    assert manifest.is_up_to_date('key', output_path, signatures)
+    with open(csv_path, 'a', encoding='utf-8') as f:
+        f.write('1;2\n')
+    assert not manifest.is_up_to_date('key', output_path, signatures)
+
+def test_stats_are_only_cached_within_a_run(tmp_path):
+    csv_path = str(tmp_path / 'histo.csv')
+    assert stat_history_files([csv_path], run='run-1')[csv_path].error == 'introuvable'
+    with open(csv_path, 'w', encoding='utf-8') as f:
+        f.write('a;b\n')
+    # Same run: the state read at the start of the run is kept
+    assert stat_history_files([csv_path], run='run-1')[csv_path].error == 'introuvable'
+    assert stat_history_files([csv_path], run='run-2')[csv_path].size == os.path.getsize(csv_path)
+    os.remove(csv_path)
+    assert stat_history_files([csv_path])[csv_path].error == 'introuvable'
+
+def test_tail_rows_across_block_boundaries(tmp_path):
+    # 201-byte rows: the block boundaries fall in the middle of rows, and the rows asked for span two blocks
+    path = tmp_path / 'histo.csv'
+    rows = [f"{i:06d};" + 'x' * 193 for i in range(1000)]
+    path.write_bytes(''.join(row + '\n' for row in rows).encode('utf-8'))
+    count = TAIL_BLOCK_SIZE // 201 + 50
+
+    assert tail_rows(str(path), count) == rows[-count:]
+    assert tail_rows(str(path), 1) == rows[-1:]
+    assert tail_rows(str(path), 2000) == rows
+
+def test_tail_rows_without_trailing_newline(tmp_path):
+    path = tmp_path / 'histo.csv'
+    path.write_bytes(b'date;statut\r\n2026-10-17;OK\r\n2026-10-18;KO')
+
+    assert tail_rows(str(path), 2) == ['2026-10-17;OK', '2026-10-18;KO']
+    assert tail_rows(str(path), 5) == ['date;statut', '2026-10-17;OK', '2026-10-18;KO']
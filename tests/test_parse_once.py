@@ -0,0 +1,41 @@
+import re
+import talend_doc_cleaner
+from talend_doc_cleaner import generate_documents
+from talend_html_generator import generate_talend_html
+
+O2T_ROW_PATTERN = re.compile(r'^\| (tO2T(?:Input|Output)_\d+) \|', re.MULTILINE)
+
+def o2t_header_names(markdown):
+    """
+    Returns the unique names listed in the One2Team header of a generated markdown file.
+    """
+    header = markdown.split('## En-tête One2Team', 1)[1].split('\n---\n', 1)[0]
+    return set(O2T_ROW_PATTERN.findall(header))
+
+def test_each_input_is_parsed_once_and_gets_its_own_o2t_header(tmp_path, monkeypatch):
+    # Both exports sit in documentations/, where the O2T header used to be looked up: each header must only
+    # list the O2T components of its own job
+    doc_dir = tmp_path / 'documentations'
+    doc_dir.mkdir()
+    documents = {'small': generate_talend_html(components=20, seed=1), 'large': generate_talend_html(components=60, seed=2)}
+    for name, html in documents.items():
+        (doc_dir / f'{name}.html').write_text(html, encoding='utf-8')
+    monkeypatch.chdir(tmp_path)
+
+    parses = []
+    parse_html = talend_doc_cleaner.parse_html
+
+    def counting_parse_html(markup, *args, **kwargs):
+        parses.append(markup)
+        return parse_html(markup, *args, **kwargs)
+
+    monkeypatch.setattr(talend_doc_cleaner, 'parse_html', counting_parse_html)
+    for name in documents:
+        generate_documents(str(doc_dir / f'{name}.html'), {'md': str(tmp_path / f'{name}.md')})
+
+    for name, html in documents.items():
+        assert sum(1 for markup in parses if markup == html) == 1, name
+        expected = set(re.findall(r'tO2T(?:Input|Output)_\d+', html))
+        assert o2t_header_names((tmp_path / f'{name}.md').read_text(encoding='utf-8')) == expected, name
+    assert o2t_header_names((tmp_path / 'small.md').read_text(encoding='utf-8')) != \
+        o2t_header_names((tmp_path / 'large.md').read_text(encoding='utf-8'))
@@ -0,0 +1,19 @@
+import json
+from main import quarantine_file
+
+def test_a_failed_file_does_not_overwrite_an_earlier_one(tmp_path):
+    doc_dir = tmp_path / 'documentations'
+    failed_dir = tmp_path / 'failed'
+    doc_dir.mkdir()
+    for attempt in ('first', 'second', 'third'):
+        (doc_dir / 'job.html').write_text(attempt, encoding='utf-8')
+        quarantine_file({'fname': 'job.html', 'reason': 'error', 'error': attempt}, str(doc_dir), str(failed_dir))
+
+    entries = [json.loads(line) for line in (failed_dir / 'failures.jsonl').read_text(encoding='utf-8').splitlines()]
+    assert [e['error'] for e in entries] == ['first', 'second', 'third']
+    assert entries[0]['file'] == 'job.html'
+    assert len({e['file'] for e in entries}) == 3
+    for entry in entries:
+        assert entry['name'] == 'job.html'
+        assert (failed_dir / entry['file']).read_text(encoding='utf-8') == entry['error']
+    assert not (doc_dir / 'job.html').exists()
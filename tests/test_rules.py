@@ -0,0 +1,41 @@
+import os
+import pytest
+from rules import KeywordMatcher, get_rules, load_rules
+
+def test_patterns_may_start_with_inline_flags():
+    matcher = KeywordMatcher(['journal'], ['(?i)^annexe \\d+$', '(?s)début.*fin'])
+
+    assert matcher('Annexe 12')
+    assert matcher('début\net fin')
+    assert matcher('Journal des erreurs')
+    assert not matcher('Annexes')
+
+def test_invalid_pattern_is_named():
+    with pytest.raises(ValueError, match=r"'annexe \('"):
+        KeywordMatcher(patterns=['annexe ('])
+
+@pytest.mark.parametrize('content, bad_entry', [
+    ('- annexe\n', "['annexe']"),
+    ('ignored_sections: annexe\n', "'annexe'"),
+    ('ignored_sections:\n  - regex: "annexe ("\n', "'annexe \\('"),
+    ('ignored_sections:\n  - 12\n', '12'),
+    ('sections: [annexe]\n', "'sections'"),
+])
+def test_invalid_rules_file_is_reported(tmp_path, content, bad_entry):
+    path = tmp_path / 'regles.yaml'
+    path.write_text(content, encoding='utf-8')
+
+    with pytest.raises(ValueError, match=bad_entry) as exc_info:
+        load_rules(str(path))
+    assert str(path) in str(exc_info.value)
+
+def test_rules_are_kept_when_the_file_becomes_invalid(tmp_path):
+    path = tmp_path / 'regles.yaml'
+    path.write_text('ignored_sections: [annexe]\n', encoding='utf-8')
+    rules = get_rules(str(path))
+    assert rules.ignored_sections('Annexe 1')
+
+    path.write_text('ignored_sections: [annexe, {regex: "("}]\n', encoding='utf-8')
+    os.utime(path, ns=(0, 0))
+
+    assert get_rules(str(path)) is rules
@@ -0,0 +1,29 @@
+import pytest
+from talend_doc_cleaner import generate_markdown
+from talend_html_generator import generate_talend_html
+from talend_stream import BLOCK_SIZE, generate_markdown_streaming, iter_section_chunks
+
+@pytest.mark.parametrize('block_size', [7, 1000, BLOCK_SIZE])
+def test_streaming_output_is_identical_to_in_memory_output(tmp_path, block_size):
+    # Small blocks cut headings across blocks and sections across many blocks; the default one holds the whole document
+    input_path = tmp_path / 'job.html'
+    input_path.write_text(generate_talend_html(components=40, sections=6, seed=3), encoding='utf-8')
+    in_memory = tmp_path / 'in_memory.md'
+    streamed = tmp_path / 'streamed.md'
+
+    facts = generate_markdown(str(input_path), str(in_memory))
+    streamed_facts = generate_markdown_streaming(str(input_path), str(streamed), block_size=block_size)
+
+    assert streamed.read_text(encoding='utf-8') == in_memory.read_text(encoding='utf-8')
+    assert streamed_facts == facts
+
+def test_section_chunks_are_cut_before_headings(tmp_path):
+    html = generate_talend_html(components=10, sections=3, seed=4)
+    input_path = tmp_path / 'job.html'
+    input_path.write_text(html, encoding='utf-8')
+
+    chunks = list(iter_section_chunks(str(input_path), block_size=500))
+
+    assert ''.join(chunks) == html
+    assert len(chunks) > 1
+    assert all(chunk.startswith('<h2') for chunk in chunks[1:])
@@ -0,0 +1,44 @@
+import json
+import os
+import time
+from work_claims import LEASE_NAME, PROCESSING_DIR, WorkClaims
+
+def write_slot(root, worker, fnames, age):
+    """
+    Creates the slot of another worker, holding fnames, whose lease was last renewed age seconds ago.
+    """
+    slot = os.path.join(root, PROCESSING_DIR, worker)
+    os.makedirs(slot)
+    for fname in fnames:
+        with open(os.path.join(slot, fname), 'w', encoding='utf-8') as f:
+            f.write(fname)
+    lease_path = os.path.join(slot, LEASE_NAME)
+    with open(lease_path, 'w', encoding='utf-8') as f:
+        json.dump({'host': 'other-host', 'pid': 1, 'started_at': ''}, f)
+    renewed = time.time() - age
+    os.utime(lease_path, (renewed, renewed))
+
+def test_a_file_is_claimed_by_a_single_worker(tmp_path):
+    root = str(tmp_path)
+    with open(os.path.join(root, 'job.html'), 'w', encoding='utf-8') as f:
+        f.write('job')
+
+    with WorkClaims(root, worker='first') as first, WorkClaims(root, worker='second') as second:
+        assert first.claim('job.html')
+        assert not second.claim('job.html')
+        assert first.claimed() == ['job.html']
+        assert second.claimed() == []
+        assert not os.path.exists(os.path.join(root, 'job.html'))
+
+def test_files_of_an_expired_lease_are_moved_back(tmp_path):
+    root = str(tmp_path)
+    write_slot(root, 'dead', ['job.html'], age=600)
+    write_slot(root, 'alive', ['other.html'], age=0)
+
+    claims = WorkClaims(root, lease=60, worker='me')
+
+    assert claims.recover() == ['job.html']
+    assert os.path.exists(os.path.join(root, 'job.html'))
+    assert not os.path.exists(os.path.join(root, PROCESSING_DIR, 'dead'))
+    assert os.path.exists(os.path.join(root, PROCESSING_DIR, 'alive', 'other.html'))
+    assert claims.claim('job.html')
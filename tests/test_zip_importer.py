@@ -0,0 +1,21 @@
+import os
+import zipfile
+from talend_zip_importer import import_zip
+
+def test_members_with_the_same_name_do_not_overwrite_each_other(tmp_path):
+    zip_path = str(tmp_path / 'export.zip')
+    with zipfile.ZipFile(zip_path, 'w') as z:
+        z.writestr('JobA_0.1/documentation.html', '<html>A</html>')
+        z.writestr('JobB_0.1/documentation.html', '<html>B</html>')
+        z.writestr('JobC_0.1/JobC_0.1.html', '<html>C</html>')
+    dest = tmp_path / 'documentations'
+    dest.mkdir()
+
+    report = import_zip(zip_path, str(dest), str(tmp_path / 'archives'))
+
+    assert report['error'] is None
+    assert [os.path.basename(p) for p in report['html_files']] == [
+        'JobA_0.1_documentation.html', 'JobB_0.1_documentation.html', 'JobC_0.1.html']
+    contents = {p.name: p.read_text(encoding='utf-8') for p in dest.iterdir()}
+    assert contents == {'JobA_0.1_documentation.html': '<html>A</html>', 'JobB_0.1_documentation.html': '<html>B</html>',
+                        'JobC_0.1.html': '<html>C</html>'}
@@ -0,0 +1,215 @@
+import json
+import os
+import socket
+import threading
+import time
+
+PROCESSING_DIR = 'processing'  # Subfolder of a watched folder holding one claim slot per running worker
+LEASE_NAME = '.lease'  # File of a claim slot identifying its worker, touched while the worker is alive
+CLAIM_LEASE = 120  # Seconds without heartbeat after which the claims of a worker are recovered by the others
+
+def worker_id():
+    """
+    Returns an identifier of the current process unique across the machines sharing a folder: <host>-<pid>.
+    """
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+def _process_alive(pid):
+    """
+    Returns False if no process pid runs on this machine (POSIX only: True when it cannot be told).
+    """
+    if os.name != 'posix':
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+class WorkClaims:
+    """
+    Claims the files of a folder shared by several workers (processes of one machine or machines sharing
+    a network folder), so that each file is processed by a single worker.
+    A worker claims a file by renaming it into its own slot, <folder>/processing/<worker id>/: the rename is atomic,
+    so when two workers claim the same file, exactly one of them gets it. A lease file in the slot, touched by a
+    heartbeat thread, tells the other workers it is alive; the files of a slot whose lease has expired (or whose
+    process is gone, on the same machine) are moved back to the folder to be claimed again.
+    """
+
+    def __init__(self, root, lease=CLAIM_LEASE, worker=None):
+        """
+        Args:
+            root (str): Folder whose files are claimed.
+            lease (float): Seconds without heartbeat after which the claims of a worker are recovered.
+            worker (str, optional): Identifier of this worker (see worker_id).
+        """
+        self.root = root
+        self.lease = lease
+        self.worker = worker or worker_id()
+        self.processing_dir = os.path.join(root, PROCESSING_DIR)
+        self.slot = os.path.join(self.processing_dir, self.worker)
+        self._stop = threading.Event()
+        self._heartbeat = None
+
+    def path(self, fname):
+        """
+        Returns the path of a file claimed by this worker.
+        """
+        return os.path.join(self.slot, fname)
+
+    def open(self):
+        """
+        Creates the slot of this worker with its lease, recovers the claims of dead workers,
+        and starts the heartbeat thread keeping the lease alive.
+        """
+        self._write_lease()
+        self.recover()
+        self._heartbeat = threading.Thread(target=self._beat, name='claims-heartbeat', daemon=True)
+        self._heartbeat.start()
+        return self
+
+    def _write_lease(self, slot=None):
+        slot = slot or self.slot
+        os.makedirs(slot, exist_ok=True)
+        with open(os.path.join(slot, LEASE_NAME), 'w', encoding='utf-8') as f:
+            json.dump({'host': socket.gethostname(), 'pid': os.getpid(), 'started_at': time.strftime('%Y-%m-%dT%H:%M:%S')}, f)
+
+    def close(self):
+        """
+        Stops the heartbeat, gives back the files still claimed (e.g. after Ctrl+C) and removes the slot.
+        """
+        self._stop.set()
+        if self._heartbeat is not None:
+            self._heartbeat.join()
+        for fname in self.claimed():
+            self.release(fname)
+        try:
+            os.remove(os.path.join(self.slot, LEASE_NAME))
+            os.rmdir(self.slot)
+        except OSError:
+            pass
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def _beat(self):
+        # Renew the lease several times per lease period, and recover the claims of the workers that stopped renewing theirs
+        while not self._stop.wait(self.lease / 4):
+            try:
+                try:
+                    os.utime(os.path.join(self.slot, LEASE_NAME))
+                except FileNotFoundError:
+                    # The slot was recovered by another worker while the heartbeat was stalled (e.g. network folder unavailable)
+                    self._write_lease()
+                self.recover()
+            except OSError as e:
+                print(f"Erreur lors du renouvellement du bail de {self.worker}: {e}")
+
+    def claim(self, fname):
+        """
+        Claims a file of the folder by moving it into the slot of this worker.
+        Returns:
+            bool: True if this worker got the file, False if another worker claimed it first (or it is gone).
+        """
+        source = os.path.join(self.root, fname)
+        try:
+            os.rename(source, self.path(fname))
+        except FileNotFoundError:
+            if not os.path.exists(source) or os.path.isdir(self.slot):
+                return False
+            # The slot was recovered by another worker: recreate it
+            self._write_lease()
+            return self.claim(fname)
+        return True
+
+    def release(self, fname):
+        """
+        Gives back a claimed file that was not consumed (e.g. its conversion failed): it is moved back to the folder,
+        unless a newer file of the same name arrived meanwhile, which supersedes it.
+        """
+        _move_back(self.path(fname), os.path.join(self.root, fname))
+
+    def claimed(self):
+        """
+        Returns the sorted names of the files claimed by this worker.
+        """
+        if not os.path.isdir(self.slot):
+            return []
+        return sorted(f for f in os.listdir(self.slot) if f != LEASE_NAME)
+
+    def is_expired(self, slot):
+        """
+        Returns True if the worker of a slot of processing/ is dead: its lease was not renewed for longer than
+        the lease period, or it ran on this machine and its process is gone.
+        """
+        lease_path = os.path.join(self.processing_dir, slot, LEASE_NAME)
+        try:
+            age = time.time() - os.path.getmtime(lease_path)
+            with open(lease_path, 'r', encoding='utf-8') as f:
+                owner = json.load(f)
+        except FileNotFoundError:
+            # Slot being created, or left by a worker that crashed before writing its lease: judged on the slot itself
+            try:
+                return time.time() - os.path.getmtime(os.path.join(self.processing_dir, slot)) > self.lease
+            except FileNotFoundError:
+                return False
+        except ValueError:
+            owner = {}
+        if age > self.lease:
+            return True
+        pid = owner.get('pid')
+        return owner.get('host') == socket.gethostname() and isinstance(pid, int) and pid > 0 and not _process_alive(pid)
+
+    def recover(self):
+        """
+        Moves the files claimed by dead workers back to the folder.
+        The slot of a dead worker is first renamed, so that only one of the workers recovering it at once does it.
+        Returns:
+            list: Names of the recovered files.
+        """
+        recovered = []
+        if not os.path.isdir(self.processing_dir):
+            return recovered
+        for slot in sorted(os.listdir(self.processing_dir)):
+            if slot == self.worker or not os.path.isdir(os.path.join(self.processing_dir, slot)) or not self.is_expired(slot):
+                continue
+            taken = os.path.join(self.processing_dir, f'.recovered-{slot}-{self.worker}')
+            try:
+                os.rename(os.path.join(self.processing_dir, slot), taken)
+            except OSError:
+                continue  # Recovered by another worker
+            try:
+                # Own the slot while moving its files back, so that no other worker recovers it at the same time
+                self._write_lease(taken)
+                fnames = sorted(f for f in os.listdir(taken) if f != LEASE_NAME)
+                for fname in fnames:
+                    _move_back(os.path.join(taken, fname), os.path.join(self.root, fname))
+                for fname in os.listdir(taken):
+                    os.remove(os.path.join(taken, fname))
+                os.rmdir(taken)
+            except FileNotFoundError:
+                continue  # Taken over by another worker
+            recovered.extend(fnames)
+            if fnames:
+                print(f"Reprise de {len(fnames)} fichier(s) de {slot}, arrêté sans les avoir traités")
+        return recovered
+
+def _move_back(path, dest):
+    """
+    Moves a claimed file back to its folder, unless a file of the same name arrived there meanwhile
+    (a newer export of the same job), in which case the claimed copy is dropped.
+    """
+    if os.path.exists(dest):
+        print(f"{os.path.basename(dest)} remplacé par un fichier plus récent, ancienne version abandonnée")
+        os.remove(path)
+        return
+    try:
+        os.rename(path, dest)
+    except FileExistsError:
+        os.remove(path)